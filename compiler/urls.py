@@ -3,13 +3,18 @@ URL Configuration for Compiler App
 
 Workflow compilation endpoints.
 """
-from django.urls import path
+from django.urls import path, include
 
 from .views import CompileWorkflowView, ValidateWorkflowView, AdHocValidateWorkflowView
 
 
+workflow_patterns = [
+    path('compile/', CompileWorkflowView.as_view(), name='workflow-compile'),
+    path('validate/', ValidateWorkflowView.as_view(), name='workflow-validate'),
+]
+
+
 urlpatterns = [
-    path('workflows/<int:workflow_id>/compile/', CompileWorkflowView.as_view(), name='workflow-compile'),
-    path('workflows/<int:workflow_id>/validate/', ValidateWorkflowView.as_view(), name='workflow-validate'),
+    path('workflows/<int:workflow_id>/', include(workflow_patterns)),
     path('compile/validate/', AdHocValidateWorkflowView.as_view(), name='adhoc-validate'),
 ]
@@ -19,6 +19,9 @@ class JWTAuthMiddleware:
     """
     Custom middleware for Channels to authenticate users via JWT in the query string.
     Expects ?token=ACCESS_TOKEN
+
+    Resolves the user once and also sets scope["authenticated"] (bool) and
+    scope["user_id"] so consumers can read auth state without touching the user.
     """
     def __init__(self, app):
         self.app = app
@@ -43,4 +46,7 @@ class JWTAuthMiddleware:
         else:
             scope["user"] = AnonymousUser()
 
+        scope["authenticated"] = not isinstance(scope["user"], AnonymousUser)
+        scope["user_id"] = scope["user"].pk if scope["authenticated"] else None
+
         return await self.app(scope, receive, send)
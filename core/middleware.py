@@ -5,12 +5,14 @@ Includes:
 - Input sanitization middleware for prompt injection prevention
 - Rate limit header middleware
 - Request logging middleware
+- Cache-Control/ETag middleware for read-mostly endpoints
 """
 import json
 import logging
 from typing import Callable, Optional
 
 from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers, set_response_etag
 from django.utils.deprecation import MiddlewareMixin
 
 from .security import get_sanitizer, SecurityViolation
@@ -219,3 +221,52 @@ class RequestLoggingMiddleware(MiddlewareMixin):
             )
         
         return response
+
+
+class CacheControlMiddleware(MiddlewareMixin):
+    """
+    Middleware to let clients cache read-mostly API responses.
+    
+    Successful GETs under CACHE_CONTROL_ENDPOINTS get a Cache-Control
+    header and an ETag, and a request whose If-None-Match still matches
+    is answered with 304 Not Modified. Responses that already carry
+    Cache-Control (e.g. never_cache views) are left alone.
+    
+    These endpoints require authentication, so responses are marked
+    private and vary on Authorization: shared caches must not replay them.
+    
+    Configuration:
+        CACHE_CONTROL_ENDPOINTS: (URL prefix, Cache-Control value) pairs
+    """
+    
+    CACHE_CONTROL_ENDPOINTS = (
+        # Node schemas only change on deploy
+        ('/api/nodes/', 'private, max-age=3600'),
+        # Templates carry per-user bookmarks, ratings and comments: the
+        # browser must revalidate every time, the ETag turns that into a 304
+        ('/api/orchestrator/templates/', 'private, no-cache'),
+    )
+    
+    def process_response(
+        self, 
+        request: HttpRequest, 
+        response: HttpResponse
+    ) -> HttpResponse:
+        """Add caching headers and short-circuit unchanged responses."""
+        if request.method != 'GET' or response.status_code != 200 or response.streaming:
+            return response
+        if response.has_header('Cache-Control'):
+            return response
+        
+        path = request.path
+        for prefix, cache_control in self.CACHE_CONTROL_ENDPOINTS:
+            if path.startswith(prefix):
+                break
+        else:
+            return response
+        
+        response['Cache-Control'] = cache_control
+        patch_vary_headers(response, ('Authorization',))
+        if not response.has_header('ETag'):
+            set_response_etag(response)
+        return get_conditional_response(request, etag=response['ETag'], response=response)
@@ -24,14 +24,19 @@ router = DefaultRouter()
 router.register(r'keys', APIKeyViewSet, basename='api-keys')
 
 
+auth_patterns = [
+    path('register/', UserRegistrationView.as_view(), name='register'),
+    path('login/', CustomTokenObtainPairView.as_view(), name='login'),
+    path('google/', GoogleLoginView.as_view(), name='google_login'),
+    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('profile/', UserProfileView.as_view(), name='profile'),
+    path('change-password/', ChangePasswordView.as_view(), name='change-password'),
+]
+
+
 urlpatterns = [
     # Authentication
-    path('auth/register/', UserRegistrationView.as_view(), name='register'),
-    path('auth/login/', CustomTokenObtainPairView.as_view(), name='login'),
-    path('auth/google/', GoogleLoginView.as_view(), name='google_login'),
-    path('auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
-    path('auth/profile/', UserProfileView.as_view(), name='profile'),
-    path('auth/change-password/', ChangePasswordView.as_view(), name='change-password'),
+    path('auth/', include(auth_patterns)),
     
     # API Keys
     path('', include(router.urls)),
@@ -0,0 +1,338 @@
+"""
+Default Credential Types
+
+Seed data for CredentialType, shared by the data migration and the
+``populate_credentials.py`` dev script. Rows are upserted by slug, and the
+whole sync is skipped when the stored rows already match this list.
+"""
+import hashlib
+
+_STANDARD_API_KEY_SCHEMA = [
+    {
+        "id": "apiKey",
+        "name": "apiKey",
+        "type": "string",
+        "required": True,
+        "description": "The API Key for this service",
+        "isPassword": True
+    }
+]
+
+DEFAULT_CREDENTIAL_TYPES = [
+    # --- EXISTING CREDENTIAL TYPES ---
+    {
+        'name': 'OpenAI',
+        'slug': 'openai',
+        'description': 'OpenAI API for GPT models',
+        'icon': 'Cloud',
+        'auth_method': 'api_key',
+        'fields_schema': [
+            {'name': 'apiKey', 'label': 'API Key', 'type': 'password', 'required': True},
+            {'name': 'baseUrl', 'label': 'Base URL', 'type': 'text', 'required': False, 'placeholder': 'https://api.openai.com/v1'}
+        ]
+    },
+    {
+        'name': 'PostgreSQL',
+        'slug': 'postgres',
+        'description': 'PostgreSQL Database Connection',
+        'icon': 'Database',
+        'auth_method': 'custom',
+        'fields_schema': [
+            {'name': 'host', 'label': 'Host', 'type': 'text', 'required': True, 'default': 'localhost'},
+            {'name': 'port', 'label': 'Port', 'type': 'text', 'required': True, 'default': '5432'},
+            {'name': 'database', 'label': 'Database Name', 'type': 'text', 'required': True},
+            {'name': 'username', 'label': 'Username', 'type': 'text', 'required': True},
+            {'name': 'password', 'label': 'Password', 'type': 'password', 'required': True}
+        ]
+    },
+    {
+        'name': 'Google OAuth2',
+        'slug': 'google-oauth2',
+        'description': 'Google Cloud Platform OAuth2',
+        'icon': 'Mail',
+        'auth_method': 'oauth2',
+        'fields_schema': [] # Managed via OAuth flow
+    },
+    {
+        'name': 'Slack Token',
+        'slug': 'slack',
+        'description': 'Slack Bot Token',
+        'icon': 'MessageSquare',
+        'auth_method': 'bearer',
+        'fields_schema': [
+            {'name': 'token', 'label': 'Bot User OAuth Token', 'type': 'password', 'required': True}
+        ]
+    },
+    {
+        'name': 'Website Login',
+        'slug': 'website-login',
+        'description': 'Login credentials for website automation',
+        'icon': 'Globe',
+        'auth_method': 'custom',
+        'fields_schema': [
+            {'name': 'loginUrl', 'label': 'Login Page URL', 'type': 'text', 'required': True, 'placeholder': 'https://example.com/login', 'public': True},
+            {'name': 'username', 'label': 'Username or Email', 'type': 'text', 'required': True, 'public': True},
+            {'name': 'password', 'label': 'Password', 'type': 'password', 'required': True}
+        ]
+    },
+    {
+        'name': 'HTTP Bearer',
+        'slug': 'http-bearer',
+        'description': 'Standard HTTP Bearer Token Authentication',
+        'icon': 'Shield',
+        'auth_method': 'bearer',
+        'fields_schema': [
+            {'name': 'token', 'label': 'Bearer Token', 'type': 'password', 'required': True}
+        ]
+    },
+    {
+        'name': 'Gemini API',
+        'slug': 'gemini-api',
+        'description': 'Google Gemini API Key',
+        'icon': 'Sparkles',
+        'auth_method': 'api_key',
+        'fields_schema': [
+            {'name': 'api_key', 'label': 'API Key', 'type': 'password', 'required': True}
+        ]
+    },
+    {
+        'name': 'Perplexity API',
+        'slug': 'perplexity-api',
+        'description': 'Perplexity AI API Key',
+        'icon': 'Search',
+        'auth_method': 'api_key',
+        'fields_schema': [
+            {'name': 'api_key', 'label': 'API Key', 'type': 'password', 'required': True}
+        ]
+    },
+    {
+        'name': 'Notion API',
+        'slug': 'notion',
+        'description': 'Notion Integration API Key',
+        'icon': 'Database',
+        'auth_method': 'api_key',
+        'fields_schema': [
+            {'name': 'api_key', 'label': 'Internal Integration Token', 'type': 'password', 'required': True}
+        ]
+    },
+    {
+        'name': 'Airtable API',
+        'slug': 'airtable',
+        'description': 'Airtable Personal Access Token',
+        'icon': 'Database',
+        'auth_method': 'api_key',
+        'fields_schema': [
+            {'name': 'api_key', 'label': 'Access Token', 'type': 'password', 'required': True}
+        ]
+    },
+    {
+        'name': 'Telegram Bot',
+        'slug': 'telegram',
+        'description': 'Telegram Bot Token',
+        'icon': 'MessageSquare',
+        'auth_method': 'api_key',
+        'fields_schema': [
+            {'name': 'bot_token', 'label': 'Bot Token', 'type': 'password', 'required': True}
+        ]
+    },
+    {
+        'name': 'Trello API',
+        'slug': 'trello',
+        'description': 'Trello API Key & Token',
+        'icon': 'trello',
+        'auth_method': 'custom',
+        'fields_schema': [
+            {'name': 'api_key', 'label': 'API Key', 'type': 'password', 'required': True},
+            {'name': 'token', 'label': 'Access Token', 'type': 'password', 'required': True}
+        ]
+    },
+    {
+        'name': 'GitHub Token',
+        'slug': 'github',
+        'description': 'GitHub Personal Access Token',
+        'icon': 'Github',
+        'auth_method': 'api_key',
+        'fields_schema': [
+            {'name': 'token', 'label': 'Personal Access Token', 'type': 'password', 'required': True}
+        ]
+    },
+    {
+        'name': 'Discord Webhook',
+        'slug': 'discord_webhook',
+        'description': 'Discord Webhook URL',
+        'icon': 'MessageSquare',
+        'auth_method': 'api_key',
+        'fields_schema': [
+            {'name': 'webhook_url', 'label': 'Webhook URL', 'type': 'password', 'required': True}
+        ]
+    },
+    {
+        'name': 'IMAP Email',
+        'slug': 'email',
+        'description': 'Email Server (IMAP) Credentials',
+        'icon': 'Mail',
+        'auth_method': 'custom',
+        'fields_schema': [
+            {'name': 'host', 'label': 'IMAP Host', 'type': 'text', 'required': True, 'placeholder': 'imap.gmail.com'},
+            {'name': 'port', 'label': 'Port', 'type': 'text', 'required': True, 'default': '993'},
+            {'name': 'username', 'label': 'Email/Username', 'type': 'text', 'required': True},
+            {'name': 'password', 'label': 'Password/App Password', 'type': 'password', 'required': True},
+            {'name': 'secure', 'label': 'Use SSL/TLS', 'type': 'boolean', 'required': False, 'default': 'true'}
+        ]
+    },
+    {
+        'name': 'Discord Bot Token',
+        'slug': 'discord_bot',
+        'description': 'Discord Bot Token',
+        'icon': 'MessageSquare',
+        'auth_method': 'api_key',
+        'fields_schema': [
+            {'name': 'bot_token', 'label': 'Bot Token', 'type': 'password', 'required': True}
+        ]
+    },
+    # --- NEW AI PROVIDER CREDENTIAL TYPES ---
+    {
+        'name': 'Anthropic API',
+        'slug': 'anthropic',
+        'description': 'API Key for Anthropic Claude',
+        'icon': '🎭',
+        'auth_method': 'api_key',
+        'fields_schema': _STANDARD_API_KEY_SCHEMA
+    },
+    {
+        'name': 'OpenRouter API',
+        'slug': 'openrouter',
+        'description': 'API Key for OpenRouter.ai',
+        'icon': '🛣️',
+        'auth_method': 'api_key',
+        'fields_schema': _STANDARD_API_KEY_SCHEMA
+    },
+    {
+        'name': 'Hugging Face API',
+        'slug': 'huggingface',
+        'description': 'Access Token for Hugging Face Inference API',
+        'icon': '🤗',
+        'auth_method': 'bearer',
+        'fields_schema': _STANDARD_API_KEY_SCHEMA
+    },
+    {
+        'name': 'Mistral API',
+        'slug': 'mistral',
+        'description': 'API Key for Mistral AI',
+        'icon': '🌪️',
+        'auth_method': 'api_key',
+        'fields_schema': _STANDARD_API_KEY_SCHEMA
+    },
+    {
+        'name': 'xAI API (Grok)',
+        'slug': 'xai',
+        'description': 'API Key for xAI',
+        'icon': '✖️',
+        'auth_method': 'api_key',
+        'fields_schema': _STANDARD_API_KEY_SCHEMA
+    },
+    {
+        'name': 'DeepSeek API',
+        'slug': 'deepseek',
+        'description': 'API Key for DeepSeek',
+        'icon': '🐳',
+        'auth_method': 'api_key',
+        'fields_schema': _STANDARD_API_KEY_SCHEMA
+    },
+    {
+        'name': 'Cohere API',
+        'slug': 'cohere',
+        'description': 'API Key for Cohere',
+        'icon': '🪐',
+        'auth_method': 'api_key',
+        'fields_schema': _STANDARD_API_KEY_SCHEMA
+    },
+    {
+        'name': 'Groq API',
+        'slug': 'groq',
+        'description': 'API Key for Groq Cloud',
+        'icon': '⚡',
+        'auth_method': 'api_key',
+        'fields_schema': _STANDARD_API_KEY_SCHEMA
+    },
+    {
+        'name': 'Tavily API',
+        'slug': 'tavily',
+        'description': 'API Key for Tavily Search',
+        'icon': 'Search',
+        'auth_method': 'api_key',
+        'fields_schema': _STANDARD_API_KEY_SCHEMA
+    },
+    {
+        'name': 'Firecrawl API',
+        'slug': 'firecrawl',
+        'description': 'API Key for Firecrawl Scraping',
+        'icon': 'Globe',
+        'auth_method': 'api_key',
+        'fields_schema': _STANDARD_API_KEY_SCHEMA
+    }
+]
+
+
+_SYNCED_FIELDS = ('name', 'description', 'icon', 'auth_method', 'fields_schema', 'is_active')
+
+
+def _row(cred_data: dict) -> dict:
+    """Normalize a seed entry into the column values stored on CredentialType."""
+    return {
+        'slug': cred_data['slug'],
+        'name': cred_data['name'],
+        'description': cred_data.get('description', ''),
+        'icon': cred_data.get('icon', ''),
+        'auth_method': cred_data.get('auth_method', 'api_key'),
+        'fields_schema': cred_data.get('fields_schema', []),
+        'is_active': True,
+    }
+
+
+def _digest(rows: list[dict]) -> str:
+    """Content hash of a set of rows, independent of ordering."""
+    ordered = sorted(
+        (tuple(row[f] for f in ('slug',) + _SYNCED_FIELDS) for row in rows),
+        key=lambda r: r[0],
+    )
+    return hashlib.blake2b(repr(ordered).encode()).hexdigest()
+
+
+def sync_credential_types(credential_type_model, types: list[dict] = None) -> int:
+    """
+    Upsert default credential types, touching only rows that changed.
+    
+    Args:
+        credential_type_model: CredentialType model class (historical model
+            when called from a migration)
+        types: Seed entries, defaults to DEFAULT_CREDENTIAL_TYPES
+        
+    Returns:
+        Number of rows created or updated
+    """
+    desired = [_row(t) for t in (types or DEFAULT_CREDENTIAL_TYPES)]
+    existing = {
+        row['slug']: row
+        for row in credential_type_model.objects.filter(
+            slug__in=[r['slug'] for r in desired]
+        ).values('slug', *_SYNCED_FIELDS)
+    }
+    
+    # Fast path: nothing changed since the last sync
+    if len(existing) == len(desired) and _digest(list(existing.values())) == _digest(desired):
+        return 0
+    
+    changed = [
+        credential_type_model(**row)
+        for row in desired
+        if existing.get(row['slug']) != row
+    ]
+    if changed:
+        credential_type_model.objects.bulk_create(
+            changed,
+            update_conflicts=True,
+            unique_fields=['slug'],
+            update_fields=list(_SYNCED_FIELDS) + ['updated_at'],
+        )
+    return len(changed)
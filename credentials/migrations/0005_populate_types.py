@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+def populate_types(apps, schema_editor):
+    from credentials.defaults import sync_credential_types
+
+    CredentialType = apps.get_model('credentials', 'CredentialType')
+    sync_credential_types(CredentialType)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('credentials', '0004_credentialtype_service_identifier'),
+    ]
+
+    operations = [
+        # Reverse is a no-op: deleting types would cascade to user credentials
+        migrations.RunPython(populate_types, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,10 @@
+import copy
+
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from unittest.mock import MagicMock, patch, AsyncMock
 from asgiref.sync import async_to_sync
+from .defaults import DEFAULT_CREDENTIAL_TYPES, sync_credential_types
 from .verification import CredentialVerifier
 from .models import Credential, CredentialType
 
@@ -11,22 +14,30 @@ class CredentialVerifierTests(TestCase):
     def setUp(self):
         self.user = User.objects.create_user(username='testuser', password='password')
         
-        # Create Dummy Types
-        self.type_openai = CredentialType.objects.create(
-            name='OpenAI', slug='openai', auth_method='api_key',
-            fields_schema=[{'name': 'apiKey', 'required': True}]
+        # Create Dummy Types (slugs overlap the types seeded by migration)
+        self.type_openai, _ = CredentialType.objects.update_or_create(
+            slug='openai', defaults=dict(
+                name='OpenAI', auth_method='api_key',
+                fields_schema=[{'name': 'apiKey', 'required': True}]
+            )
         )
-        self.type_slack = CredentialType.objects.create(
-            name='Slack', slug='slack', auth_method='bearer',
-            fields_schema=[{'name': 'token', 'required': True}]
+        self.type_slack, _ = CredentialType.objects.update_or_create(
+            slug='slack', defaults=dict(
+                name='Slack', auth_method='bearer',
+                fields_schema=[{'name': 'token', 'required': True}]
+            )
         )
-        self.type_google = CredentialType.objects.create(
-            name='Google', slug='google-oauth2', auth_method='oauth2',
-            oauth_config={'auth_url': 'https://accounts.google.com', 'token_url': 'https://oauth2.googleapis.com/token'}
+        self.type_google, _ = CredentialType.objects.update_or_create(
+            slug='google-oauth2', defaults=dict(
+                name='Google', auth_method='oauth2',
+                oauth_config={'auth_url': 'https://accounts.google.com', 'token_url': 'https://oauth2.googleapis.com/token'}
+            )
         )
-        self.type_custom = CredentialType.objects.create(
-            name='Website', slug='website-login', auth_method='custom',
-            fields_schema=[{'name': 'loginUrl', 'required': True}]
+        self.type_custom, _ = CredentialType.objects.update_or_create(
+            slug='website-login', defaults=dict(
+                name='Website', auth_method='custom',
+                fields_schema=[{'name': 'loginUrl', 'required': True}]
+            )
         )
 
     @patch('requests.get')
@@ -158,3 +169,55 @@ class CredentialsSerializationTests(APITestCase):
         response = self.client.post(url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('code', response.data)
+
+
+class CredentialTypeSyncTests(TestCase):
+    """
+    Tests for sync_credential_types idempotency and targeted upserts.
+    """
+    def setUp(self):
+        # Migration 0005 seeds the defaults; make sure they are current
+        sync_credential_types(CredentialType)
+        self.updated_at = dict(CredentialType.objects.values_list('slug', 'updated_at'))
+
+    def test_second_sync_writes_nothing(self):
+        """A sync with unchanged defaults is one SELECT and no writes."""
+        with self.assertNumQueries(1):
+            changed = sync_credential_types(CredentialType)
+        
+        self.assertEqual(changed, 0)
+        self.assertEqual(
+            dict(CredentialType.objects.values_list('slug', 'updated_at')), self.updated_at
+        )
+
+    def test_changed_default_upserts_only_that_row(self):
+        """Editing one default updates that row in place and leaves the rest alone."""
+        types = copy.deepcopy(DEFAULT_CREDENTIAL_TYPES)
+        target = types[0]
+        target['description'] = 'Updated description'
+        count = CredentialType.objects.count()
+        
+        changed = sync_credential_types(CredentialType, types)
+        
+        self.assertEqual(changed, 1)
+        self.assertEqual(CredentialType.objects.count(), count)
+        self.assertEqual(CredentialType.objects.filter(slug=target['slug']).count(), 1)
+        self.assertEqual(
+            CredentialType.objects.get(slug=target['slug']).description, 'Updated description'
+        )
+        after = dict(CredentialType.objects.values_list('slug', 'updated_at'))
+        self.assertNotEqual(after.pop(target['slug']), self.updated_at.pop(target['slug']))
+        self.assertEqual(after, self.updated_at)
+        
+        # And the next run with the same entries is a no-op again
+        self.assertEqual(sync_credential_types(CredentialType, types), 0)
+
+    def test_drifted_row_is_restored(self):
+        """A row edited outside the defaults is put back on the next sync."""
+        slug = DEFAULT_CREDENTIAL_TYPES[1]['slug']
+        CredentialType.objects.filter(slug=slug).update(is_active=False, name='Renamed')
+        
+        self.assertEqual(sync_credential_types(CredentialType), 1)
+        row = CredentialType.objects.get(slug=slug)
+        self.assertTrue(row.is_active)
+        self.assertEqual(row.name, DEFAULT_CREDENTIAL_TYPES[1]['name'])
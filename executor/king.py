@@ -460,8 +460,8 @@ Output ONLY the JSON object, no other text."""
                 node_id=data.get('node_id') or 'orchestrator'
             )
         elif self.user_id: # Fallback for non-execution specific broadcasts
-            from channels.layers import get_channel_layer
-            channel_layer = get_channel_layer()
+            from streaming.utils import get_shared_channel_layer
+            channel_layer = get_shared_channel_layer()
             if channel_layer:
                 await channel_layer.group_send(
                     f"hitl_{self.user_id}",
@@ -81,9 +81,9 @@ def execute_workflow_async(
         user_id: User triggering the execution
         input_data: Initial input data
     """
-    import asyncio
     from executor.king import get_orchestrator
     from orchestrator.models import Workflow
+    from streaming.utils import run_async
     
     try:
         workflow = Workflow.objects.get(id=workflow_id, user_id=user_id)
@@ -120,7 +120,7 @@ def execute_workflow_async(
         }
     
     try:
-        result = asyncio.run(run())
+        result = run_async(run())
         return result
     except Exception as e:
         logger.exception(f"Workflow execution failed: {e}")
@@ -334,6 +334,8 @@ def cleanup_expired_hitl_requests():
     pending = HITLRequest.objects.filter(status='pending')
     expired_count = 0
     
+    expired_ids = []
+    
     for request in pending:
         timeout = request.timeout_seconds or 300
         expiry = request.created_at + timedelta(seconds=timeout)
@@ -341,14 +343,43 @@ def cleanup_expired_hitl_requests():
         if timezone.now() > expiry:
             request.status = 'timeout'
             request.save()
+            expired_ids.append(request.request_id)
             expired_count += 1
     
     if expired_count:
+        from streaming import hitl_state
+        hitl_state.clear_sync(expired_ids)
         logger.info(f"Expired {expired_count} HITL requests")
     
     return {"expired": expired_count}
 
 
+@shared_task
+def persist_hitl_response(request_id: str, user_id: int, status: str, response):
+    """
+    Persist a HITL response that was already accepted in Redis.
+    
+    The WebSocket consumers record the pending -> answered transition in
+    Redis first (see streaming.hitl_state) and defer the Postgres write here.
+    """
+    from orchestrator.models import HITLRequest
+    
+    updated = HITLRequest.objects.filter(
+        request_id=request_id,
+        user_id=user_id,
+        status='pending'
+    ).update(
+        status=status,
+        response=response,
+        responded_at=timezone.now()
+    )
+    
+    if not updated:
+        logger.warning(f"HITL request {request_id} was no longer pending when persisting response")
+    
+    return {"updated": updated}
+
+
 @shared_task
 def refresh_oauth_tokens():
     """
@@ -437,6 +468,7 @@ def test_workflow_async(self, workflow_id: int):
     from executor.test_generator import generate_test_input, validate_test_result
     from executor.king import get_orchestrator
     from logs.models import ExecutionLog
+    from streaming.utils import run_async
 
     try:
         workflow = Workflow.objects.get(id=workflow_id)
@@ -475,7 +507,7 @@ def test_workflow_async(self, workflow_id: int):
         return handle
 
     try:
-        handle = asyncio.run(run_test())
+        handle = run_async(run_test())
     except Exception as e:
         return {"status": "error", "message": f"Test execution error: {e}"}
     
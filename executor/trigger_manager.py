@@ -1,6 +1,10 @@
+import asyncio
 import json
 import logging
+import weakref
+
 import redis
+import redis.asyncio as aioredis
 from django.conf import settings
 from workflow_backend.celery import app
 
@@ -19,6 +23,10 @@ class TriggerManager:
     def __init__(self):
         # Use existing Celery broker URL for Redis connection
         self._redis = redis.from_url(settings.CELERY_BROKER_URL, decode_responses=True)
+        # redis.asyncio clients are bound to the loop that opened them
+        self._async_redis: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aioredis.Redis]' = (
+            weakref.WeakKeyDictionary()
+        )
 
     def register_triggers(self, workflow):
         """
@@ -113,6 +121,25 @@ class TriggerManager:
             return json.loads(data)
         return None
 
+    async def alookup_webhook(self, user_id: int, path: str) -> dict | None:
+        """
+        Async variant of lookup_webhook for the ASGI webhook receiver.
+        """
+        path = path.strip("/")
+        data = await self._get_async_redis().get(f"webhook:{user_id}/{path}")
+        if data:
+            return json.loads(data)
+        return None
+
+    def _get_async_redis(self) -> aioredis.Redis:
+        loop = asyncio.get_running_loop()
+        client = self._async_redis.get(loop)
+        if client is None:
+            client = self._async_redis[loop] = aioredis.from_url(
+                settings.CELERY_BROKER_URL, decode_responses=True
+            )
+        return client
+
     def _register_schedule(self, workflow, config):
         """
         Add a periodic task to Celery Beat.
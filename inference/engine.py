@@ -224,6 +224,20 @@ class KnowledgeBase:
         embeddings = await asyncio.to_thread(self._embedder.encode, [text])
         return embeddings[0]
     
+    async def embed_texts(self, texts: List[str]) -> Any:
+        """
+        Generate embeddings for many texts in one batched model call.
+        
+        Returns:
+            (len(texts), dim) array, or None if the embedder is unavailable.
+        """
+        if not self._initialized:
+            await self.initialize()
+            if not self._initialized:
+                return None
+        
+        return await asyncio.to_thread(self._embedder.encode, texts)
+    
     def _chunk_text(
         self,
         text: str,
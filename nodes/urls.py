@@ -14,8 +14,8 @@ from .views import (
 
 
 urlpatterns = [
-    path('nodes/', NodeSchemaListView.as_view(), name='node-list'),
-    path('nodes/categories/', NodeSchemaByCategory.as_view(), name='node-categories'),
-    path('nodes/models/', AIModelListView.as_view(), name='ai-models'),
-    path('nodes/<str:node_type>/', NodeSchemaDetailView.as_view(), name='node-detail'),
+    path('', NodeSchemaListView.as_view(), name='node-list'),
+    path('categories/', NodeSchemaByCategory.as_view(), name='node-categories'),
+    path('models/', AIModelListView.as_view(), name='ai-models'),
+    path('<str:node_type>/', NodeSchemaDetailView.as_view(), name='node-detail'),
 ]
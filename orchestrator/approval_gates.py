@@ -24,6 +24,17 @@ class ApprovalAction(str, Enum):
     TIMEOUT = "timeout"
 
 
+# Response 'action' values accepted from the WebSocket and REST answer paths
+_RESPONSE_ACTIONS = {
+    'approve': ApprovalAction.APPROVE,
+    'approved': ApprovalAction.APPROVE,
+    'reject': ApprovalAction.REJECT,
+    'rejected': ApprovalAction.REJECT,
+    'skip': ApprovalAction.SKIP,
+    'retry': ApprovalAction.RETRY,
+}
+
+
 class ApprovalGate:
     """
     Blocking approval gate for HITL workflows.
@@ -92,6 +103,9 @@ class ApprovalGate:
         # Send notification
         await self._send_notification()
         
+        # Pick up answers given over WebSocket/REST in any process. It
+        # subscribes before checking Redis, so nothing answered so far is lost.
+        relay = asyncio.create_task(self._relay_published_response())
         try:
             # Wait for response
             response = await asyncio.wait_for(
@@ -105,7 +119,7 @@ class ApprovalGate:
             # Update database
             await self._update_database(response)
             
-            action = ApprovalAction(response.get('action', 'approve'))
+            action = self._action_for(response)
             
             return ApprovalResult(
                 approved=action == ApprovalAction.APPROVE,
@@ -126,11 +140,42 @@ class ApprovalGate:
                 response={'action': self.auto_action.value, 'reason': 'timeout'},
                 timed_out=True,
             )
+        finally:
+            relay.cancel()
+            await asyncio.gather(relay, return_exceptions=True)
+    
+    def _action_for(self, response: dict) -> ApprovalAction:
+        """
+        Map a response to the action the workflow takes.
+        
+        Free-form answers ('answer', or anything unknown) carry a value rather
+        than a decision: they take auto_action if it is one, else APPROVE.
+        """
+        action = _RESPONSE_ACTIONS.get(response.get('action', 'approve'))
+        if action is not None:
+            return action
+        if self.auto_action != ApprovalAction.TIMEOUT:
+            return self.auto_action
+        return ApprovalAction.APPROVE
     
     async def submit_response(self, response: dict) -> None:
         """Submit a response to this approval gate."""
         await self._response_queue.put(response)
     
+    async def _relay_published_response(self) -> None:
+        """Forward the response published on hitl_resume:{execution_id} to the queue."""
+        from streaming import hitl_state
+        
+        response = await hitl_state.wait_for_response(self.execution_id, self.request_id)
+        if response is None:
+            return
+        
+        if not isinstance(response, dict) or 'action' not in response:
+            status = hitl_state.hitl_status_for(response)
+            action = ApprovalAction.REJECT if status == 'rejected' else ApprovalAction.APPROVE
+            response = {'action': action.value, 'value': response}
+        await self.submit_response(response)
+    
     async def _save_to_database(self) -> None:
         """Save approval request to database."""
         from asgiref.sync import sync_to_async
@@ -159,6 +204,10 @@ class ApprovalGate:
             )
         
         await save()
+        
+        # Mirror into Redis so WebSocket responses can take the CAS fast path
+        from streaming import hitl_state
+        await hitl_state.mark_pending(self.request_id, self.user_id, self.timeout_seconds)
     
     async def _update_database(self, response: dict, status: str = 'approved') -> None:
         """Update database with response."""
@@ -171,9 +220,9 @@ class ApprovalGate:
                 request = HITLRequest.objects.get(request_id=self.request_id)
                 
                 action = response.get('action', 'approve')
-                if action in ('approve', 'approved'):
+                if _RESPONSE_ACTIONS.get(action) == ApprovalAction.APPROVE:
                     request.status = 'approved'
-                elif action in ('reject', 'rejected'):
+                elif _RESPONSE_ACTIONS.get(action) == ApprovalAction.REJECT:
                     request.status = 'rejected'
                 elif action == 'timeout':
                     request.status = 'timeout'
@@ -188,6 +237,10 @@ class ApprovalGate:
                 pass
         
         await update()
+        
+        # The row is no longer pending; late WebSocket answers must not be accepted
+        from streaming import hitl_state
+        await hitl_state.clear(self.request_id)
     
     async def _send_notification(self) -> None:
         """Send notification to user."""
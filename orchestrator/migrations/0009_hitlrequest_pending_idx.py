@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orchestrator', '0008_alter_workflow_context'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hitlrequest',
+            index=models.Index(fields=['user', 'status', '-created_at'], name='hitl_pending_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='hitlrequest',
+            name='orchestrato_user_id_75f173_idx',
+        ),
+    ]
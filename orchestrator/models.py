@@ -385,7 +385,8 @@ class HITLRequest(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['request_id']),
-            models.Index(fields=['user', 'status']),
+            # Serves the per-user pending list (filter user+status, newest first)
+            models.Index(fields=['user', 'status', '-created_at'], name='hitl_pending_idx'),
             models.Index(fields=['execution', 'status']),
             models.Index(fields=['status', '-created_at']),
         ]
@@ -1,9 +1,25 @@
+import asyncio
+from unittest import skipUnless
+from unittest.mock import AsyncMock, patch
+
+import redis
+from django.conf import settings
+from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth.models import User
+from logs.models import ExecutionLog
+from .approval_gates import ApprovalAction, ApprovalGate
 from .models import Workflow, HITLRequest, ConversationMessage
 
+
+def _redis_available() -> bool:
+    try:
+        return redis.from_url(settings.REDIS_URL, socket_connect_timeout=0.5).ping()
+    except redis.RedisError:
+        return False
+
 class OrchestratorSerializationTests(APITestCase):
     """
     Tests for Orchestrator serializers and views validation.
@@ -113,3 +129,83 @@ class OrchestratorSerializationTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         # response might be a list or pagination?
         # Assuming list for simple view.
+
+
+class ApprovalGateTests(TestCase):
+    """
+    Tests for ApprovalGate responses relayed over hitl_resume.
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(username='approver', password='password123')
+        self.workflow = Workflow.objects.create(
+            user=self.user, name="Gate Workflow", nodes=[], edges=[]
+        )
+        self.execution = ExecutionLog.objects.create(
+            user=self.user, workflow=self.workflow, status="running"
+        )
+
+    def _gate(self, **kwargs):
+        return ApprovalGate(
+            execution_id=self.execution.execution_id,
+            node_id='send_email',
+            user_id=self.user.id,
+            message='Send the email?',
+            **kwargs
+        )
+
+    def test_response_actions(self):
+        """REST/WebSocket action spellings map to an ApprovalAction, never raise."""
+        gate = self._gate()
+        self.assertEqual(gate._action_for({'action': 'approved'}), ApprovalAction.APPROVE)
+        self.assertEqual(gate._action_for({'action': 'reject'}), ApprovalAction.REJECT)
+        self.assertEqual(gate._action_for({'action': 'rejected'}), ApprovalAction.REJECT)
+        self.assertEqual(gate._action_for({'value': 'yes'}), ApprovalAction.APPROVE)
+        self.assertEqual(gate._action_for({'action': 'answer', 'value': 'x'}), ApprovalAction.APPROVE)
+        
+        gate = self._gate(auto_action=ApprovalAction.SKIP)
+        self.assertEqual(gate._action_for({'action': 'answer', 'value': 'x'}), ApprovalAction.SKIP)
+
+    async def _answer_and_wait(self, gate, response, status):
+        """Answer the gate the way respond_to_hitl does and return its result."""
+        from streaming import hitl_state
+        
+        with patch('streaming.consumers.send_hitl_request_to_user', new=AsyncMock()):
+            waiter = asyncio.create_task(gate.wait_for_approval(timeout=5))
+            # The gate mirrors the request into Redis once its row is saved
+            for _ in range(200):
+                claimed = await hitl_state.answer(gate.request_id, self.user.id, status, response)
+                if claimed is not None:
+                    break
+                await asyncio.sleep(0.01)
+            self.assertTrue(claimed)
+            await hitl_state.publish_resume(gate.execution_id, gate.request_id, response)
+            return await asyncio.wait_for(waiter, 5)
+
+    @skipUnless(_redis_available(), "Redis is not reachable")
+    async def test_rest_answer_resumes_gate(self):
+        """An 'answer' action relayed from REST resumes the gate instead of crashing it."""
+        gate = self._gate()
+        result = await self._answer_and_wait(
+            gate, {'action': 'answer', 'value': 'Ship it'}, 'answered'
+        )
+        
+        self.assertFalse(result.timed_out)
+        self.assertEqual(result.action, ApprovalAction.APPROVE)
+        self.assertEqual(result.response['value'], 'Ship it')
+        request = await HITLRequest.objects.aget(request_id=gate.request_id)
+        self.assertEqual(request.status, 'approved')
+
+    @skipUnless(_redis_available(), "Redis is not reachable")
+    async def test_websocket_rejection_resumes_gate(self):
+        """A bare WebSocket answer is normalized and rejects the gate."""
+        from streaming import hitl_state
+        
+        gate = self._gate()
+        result = await self._answer_and_wait(gate, 'rejected', 'rejected')
+        
+        self.assertTrue(result.rejected)
+        self.assertEqual(result.response, {'action': 'reject', 'value': 'rejected'})
+        request = await HITLRequest.objects.aget(request_id=gate.request_id)
+        self.assertEqual(request.status, 'rejected')
+        # The row is settled, so a late answer no longer finds pending state
+        self.assertIsNone(await hitl_state.answer(gate.request_id, self.user.id, 'approved', 'approve'))
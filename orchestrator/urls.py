@@ -1,49 +1,74 @@
 """
 Orchestrator App URL Configuration
 """
-from django.urls import path
+from django.urls import path, include
 
 from . import views
 from .views import export_workflow_zip
 
 app_name = 'orchestrator'
 
-urlpatterns = [
+workflow_patterns = [
     # Workflow CRUD
-    path('workflows/', views.workflow_list, name='workflow_list'),
-    path('workflows/<int:workflow_id>/', views.workflow_detail, name='workflow_detail'),
-    path('workflows/<int:workflow_id>/deploy/', views.deploy_workflow, name='deploy_workflow'),
-    path('workflows/<int:workflow_id>/undeploy/', views.undeploy_workflow, name='undeploy_workflow'),
+    path('', views.workflow_list, name='workflow_list'),
+    path('<int:workflow_id>/', views.workflow_detail, name='workflow_detail'),
+    path('<int:workflow_id>/deploy/', views.deploy_workflow, name='deploy_workflow'),
+    path('<int:workflow_id>/undeploy/', views.undeploy_workflow, name='undeploy_workflow'),
     
     # Version History
-    path('workflows/<int:workflow_id>/versions/', views.workflow_versions, name='workflow_versions'),
-    path('workflows/<int:workflow_id>/versions/<int:version_id>/restore/', views.restore_version, name='restore_version'),
+    path('<int:workflow_id>/versions/', views.workflow_versions, name='workflow_versions'),
+    path('<int:workflow_id>/versions/<int:version_id>/restore/', views.restore_version, name='restore_version'),
     
     # Execution Control
-    path('workflows/<int:workflow_id>/execute/', views.execute_workflow, name='execute_workflow'),
-    path('executions/<str:execution_id>/status/', views.execution_status, name='execution_status'),
-    path('executions/<str:execution_id>/pause/', views.pause_execution, name='pause_execution'),
-    path('executions/<str:execution_id>/resume/', views.resume_execution, name='resume_execution'),
-    path('executions/<str:execution_id>/stop/', views.stop_execution, name='stop_execution'),
+    path('<int:workflow_id>/execute/', views.execute_workflow, name='execute_workflow'),
     
-    # HITL
-    path('hitl/pending/', views.pending_hitl_requests, name='pending_hitl'),
-    path('hitl/<str:request_id>/respond/', views.respond_to_hitl, name='respond_hitl'),
+    # Partial Execution (Test Step)
+    path('execute_partial/', views.execute_partial, name='execute_partial'),
+    path('<int:workflow_id>/execute_partial/', views.execute_partial, name='execute_partial_workflow'),
     
-    # AI Chat
-    path('chat/', views.conversation_messages, name='chat_list'),
-    path('chat/<str:conversation_id>/', views.conversation_messages, name='chat_detail'),
-    path('chat/<str:conversation_id>/messages/<int:message_id>/', views.conversation_messages, name='chat_message_detail'),
-    path('chat/context-aware/', views.context_aware_chat, name='context_aware_chat'),
+    # AI Workflow Modification
+    path('<int:workflow_id>/ai/modify/', views.modify_workflow, name='modify_workflow'),
+    path('<int:workflow_id>/ai/suggest/', views.suggest_improvements, name='suggest_improvements'),
     
-    # Partial Execution (Test Step)
-    path('workflows/execute_partial/', views.execute_partial, name='execute_partial'),
-    path('workflows/<int:workflow_id>/execute_partial/', views.execute_partial, name='execute_partial_workflow'),
+    # Templates & Testing
+    path('<int:workflow_id>/test/', views.test_workflow, name='test_workflow'),
+    path('<int:workflow_id>/clone/', views.clone_workflow, name='clone_workflow'),
+    
+    # Standalone Export
+    path('<int:workflow_id>/export/', export_workflow_zip, name='export_workflow'),
+]
+
+execution_patterns = [
+    path('<str:execution_id>/status/', views.execution_status, name='execution_status'),
+    path('<str:execution_id>/pause/', views.pause_execution, name='pause_execution'),
+    path('<str:execution_id>/resume/', views.resume_execution, name='resume_execution'),
+    path('<str:execution_id>/stop/', views.stop_execution, name='stop_execution'),
+    
+    # Thought History
+    path('<str:execution_id>/thoughts/', views.thought_history, name='thought_history'),
+]
+
+hitl_patterns = [
+    path('pending/', views.pending_hitl_requests, name='pending_hitl'),
+    path('<str:request_id>/respond/', views.respond_to_hitl, name='respond_hitl'),
+]
+
+chat_patterns = [
+    path('', views.conversation_messages, name='chat_list'),
+    path('<str:conversation_id>/', views.conversation_messages, name='chat_detail'),
+    path('<str:conversation_id>/messages/<int:message_id>/', views.conversation_messages, name='chat_message_detail'),
+    path('context-aware/', views.context_aware_chat, name='context_aware_chat'),
+]
+
+# Grouped by first path segment so the resolver skips whole groups
+urlpatterns = [
+    path('workflows/', include(workflow_patterns)),
+    path('executions/', include(execution_patterns)),
+    path('hitl/', include(hitl_patterns)),
+    path('chat/', include(chat_patterns)),
     
     # AI Workflow Generation
     path('ai/generate/', views.generate_workflow, name='generate_workflow'),
-    path('workflows/<int:workflow_id>/ai/modify/', views.modify_workflow, name='modify_workflow'),
-    path('workflows/<int:workflow_id>/ai/suggest/', views.suggest_improvements, name='suggest_improvements'),
     
     # Background Tasks
     path('background-tasks/', views.background_tasks, name='background_tasks'),
@@ -51,16 +76,4 @@ urlpatterns = [
     # Settings
     path('settings/update/', views.update_orchestrator_settings, name='update_orchestrator_settings'),
     path('system/info/', views.system_info, name='system_info'),
-    
-    # Thought History
-    path('executions/<str:execution_id>/thoughts/', views.thought_history, name='thought_history'),
-    
-    
-    # Templates & Testing
-    path('workflows/<int:workflow_id>/test/', views.test_workflow, name='test_workflow'),
-    path('workflows/<int:workflow_id>/clone/', views.clone_workflow, name='clone_workflow'),
-    
-    # Standalone Export
-    path('workflows/<int:workflow_id>/export/', export_workflow_zip, name='export_workflow'),
 ]
-
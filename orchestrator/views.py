@@ -606,16 +606,30 @@ async def respond_to_hitl(request, request_id: str):
         'value': value,
         'message': message,
     }
+    
+    # Claim the request in Redis too, so a WebSocket answer racing this
+    # one (accepted there but not yet persisted) cannot both win
+    from streaming import hitl_state
+    claimed = await hitl_state.answer(
+        request_id, request.user.id, hitl_request.status, hitl_request.response
+    )
+    if claimed is False:
+        return Response({'error': 'Request not found or already responded'}, status=404)
+    
     hitl_request.responded_at = timezone.now()
     await hitl_request.asave()
     
-    # Notify orchestrator
+    # Notify orchestrator (respond_to_hitl is synchronous and returns a bool)
     orchestrator = get_orchestrator(request.user.id)
-    await orchestrator.respond_to_hitl(
+    orchestrator.respond_to_hitl(
         request_id=request_id,
         response={'action': action, 'value': value},
     )
     
+    # Resume an approval gate waiting on this request, in whichever process runs it
+    from streaming.consumers import notify_execution_resume
+    await notify_execution_resume(request_id, {'action': action, 'value': value})
+    
     return Response({
         'request_id': request_id,
         'status': hitl_request.status,
@@ -1386,13 +1400,14 @@ _webhook_logger = _logging.getLogger(__name__)
 
 
 @csrf_exempt
-def receive_webhook(request, user_id, webhook_path):
+async def receive_webhook(request, user_id, webhook_path):
     """
     Public entry point for external webhooks.
     Matches user_id and path in Redis registry.
     """
+    user_id = int(user_id)
     mgr = get_trigger_manager()
-    config = mgr.lookup_webhook(user_id, webhook_path)
+    config = await mgr.alookup_webhook(user_id, webhook_path)
     
     if not config:
         _webhook_logger.warning(f"Webhook not found: {user_id}/{webhook_path}")
@@ -1477,8 +1492,8 @@ def receive_webhook(request, user_id, webhook_path):
     
     _webhook_logger.info(f"Triggering workflow {workflow_id} via webhook {user_id}/{webhook_path}")
     
-    # We use .delay() to send it to Celery
-    task = execute_workflow_async.delay(
+    # We use .delay() to send it to Celery; the broker publish is blocking I/O
+    task = await sync_to_async(execute_workflow_async.delay, thread_sensitive=False)(
         workflow_id=workflow_id,
         user_id=target_user_id,
         input_data=input_data
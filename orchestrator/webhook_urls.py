@@ -0,0 +1,15 @@
+"""
+Public Webhook URL Configuration
+
+Mounted under api/webhooks/ so the route regex only runs for requests
+that are actually webhook deliveries. The route is a single re_path
+rather than <int:>/<path:> converters; receive_webhook casts user_id.
+"""
+from django.urls import re_path
+
+from .views import receive_webhook
+
+
+urlpatterns = [
+    re_path(r'^(?P<user_id>[0-9]+)/(?P<webhook_path>.+)$', receive_webhook, name='webhook_receiver'),
+]
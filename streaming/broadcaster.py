@@ -19,21 +19,24 @@ Usage:
             yield event
 """
 import asyncio
-import json
 import logging
+import time
 from datetime import datetime
 from typing import AsyncGenerator, Optional
 from uuid import UUID
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field
 
+import orjson
 from django.core.cache import cache
-from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 
+from .event_writer import get_event_writer
+from .utils import dumps, get_redis
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class StreamEvent:
     """Server-Sent Event data structure."""
     event_type: str
@@ -41,40 +44,259 @@ class StreamEvent:
     id: Optional[str] = None
     retry: Optional[int] = None
     timestamp: str = None
+    _encoded: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         if self.timestamp is None:
             self.timestamp = datetime.utcnow().isoformat()
     
+    def to_dict(self) -> dict:
+        """Serializable fields, as sent over the channel layer / Redis."""
+        return {
+            'event_type': self.event_type,
+            'data': self.data,
+            'id': self.id,
+            'retry': self.retry,
+            'timestamp': self.timestamp,
+        }
+    
+    def encode_sse(self) -> bytes:
+        """
+        SSE message as bytes, encoded once per event.
+        
+        The same event object is fanned out to every subscriber queue, so
+        all subscribers share this single buffer. The JSON payload is
+        spliced in as bytes, without a str round-trip.
+        """
+        if self._encoded is None:
+            parts = []
+            
+            if self.id:
+                parts.append(b"id: " + str(self.id).encode() + b"\n")
+            
+            parts.append(b"event: " + self.event_type.encode() + b"\n")
+            parts.append(b"data: " + dumps({
+                'type': self.event_type,
+                'data': self.data,
+                'timestamp': self.timestamp,
+            }) + b"\n")
+            
+            if self.retry:
+                parts.append(b"retry: " + str(self.retry).encode() + b"\n")
+            
+            # SSE messages end with double newline
+            parts.append(b"\n")
+            self._encoded = b"".join(parts)
+        return self._encoded
+    
     def format_sse(self) -> str:
         """Format as SSE message."""
-        lines = []
+        return self.encode_sse().decode()
+
+
+# SSE comment line; keeps proxies and EventSource connections alive
+SSE_HEARTBEAT = b": heartbeat\n\n"
+
+
+class ExecutionEventHub:
+    """
+    Per-process fan-out of execution events over Redis pub/sub.
+    
+    Each event is published once to ``execution:{execution_id}``. A process
+    holds a single SUBSCRIBE connection for all executions it is following
+    and demultiplexes messages into local queues (SSE streams and WebSocket
+    consumers alike), so fan-out costs one PUBLISH regardless of subscriber
+    count. Without Redis, publishes are delivered to local queues directly.
+    Published events are also handed to the StreamEventWriter for replay.
+    """
+    
+    # Seconds to skip Redis after a connection failure
+    REDIS_RETRY_SECONDS = 5.0
+    
+    def __init__(self):
+        self._redis_retry_at = 0.0
+        self._pubsub = None
+        self._reader: Optional[asyncio.Task] = None
+        self._queues: dict[str, set[asyncio.Queue]] = {}
+        # Followed executions whose Redis SUBSCRIBE has not gone through yet
+        self._unsubscribed: set[str] = set()
+    
+    @property
+    def redis(self):
+        """Get async Redis client for the running loop, or None while backing off."""
+        if time.monotonic() < self._redis_retry_at:
+            return None
+        try:
+            return get_redis()
+        except Exception:
+            return None
+    
+    def _redis_failed(self, action: str, error: Exception):
+        logger.warning(f"Redis {action} failed, using local delivery: {error}")
+        self._redis_retry_at = time.monotonic() + self.REDIS_RETRY_SECONDS
+    
+    @staticmethod
+    def channel(execution_id: str) -> str:
+        """Redis pub/sub channel name for an execution."""
+        return f"execution:{execution_id}"
+    
+    async def publish(self, execution_id: str | UUID, event: StreamEvent):
+        """Publish an event to every subscriber of an execution."""
+        execution_id = str(execution_id)
+        get_event_writer().record(execution_id, event)
         
-        if self.id:
-            lines.append(f"id: {self.id}")
+        redis = self.redis
+        if redis:
+            if self._unsubscribed:
+                await self._subscribe_pending()
+            try:
+                await redis.publish(self.channel(execution_id), dumps(event.to_dict()))
+                return
+            except Exception as e:
+                self._redis_failed('publish', e)
         
-        lines.append(f"event: {self.event_type}")
+        self._dispatch(execution_id, event)
+    
+    async def publish_many(self, batched: list[tuple[str, StreamEvent]]):
+        """Publish a burst of events in a single pipelined Redis round-trip."""
+        writer = get_event_writer()
+        for execution_id, event in batched:
+            writer.record(execution_id, event)
         
-        data_dict = {
-            'type': self.event_type,
-            'data': self.data,
-            'timestamp': self.timestamp,
-        }
-        lines.append(f"data: {json.dumps(data_dict)}")
+        redis = self.redis
+        if redis:
+            if self._unsubscribed:
+                await self._subscribe_pending()
+            try:
+                pipe = redis.pipeline(transaction=False)
+                for execution_id, event in batched:
+                    pipe.publish(self.channel(str(execution_id)), dumps(event.to_dict()))
+                await pipe.execute()
+                return
+            except Exception as e:
+                self._redis_failed('pipelined publish', e)
+        
+        for execution_id, event in batched:
+            self._dispatch(str(execution_id), event)
+    
+    async def subscribe(self, execution_id: str | UUID, queue: asyncio.Queue):
+        """Deliver events for an execution into ``queue``."""
+        execution_id = str(execution_id)
+        queues = self._queues.setdefault(execution_id, set())
+        first = not queues
+        queues.add(queue)
+        
+        if first:
+            self._unsubscribed.add(execution_id)
+            await self._subscribe_pending()
+    
+    async def _subscribe_pending(self):
+        """
+        SUBSCRIBE every followed execution that has no Redis subscription.
+        
+        Executions whose SUBSCRIBE failed stay pending and are retried here
+        once Redis is back (on the next subscribe or publish), so their
+        local queues do not silently stop receiving events.
+        """
+        redis = self.redis
+        if not redis or not self._unsubscribed:
+            return
+        
+        pending = tuple(self._unsubscribed)
+        try:
+            if self._pubsub is None:
+                self._pubsub = redis.pubsub()
+            await self._pubsub.subscribe(*(self.channel(e) for e in pending))
+        except Exception as e:
+            self._redis_failed('subscribe', e)
+            return
+        
+        self._unsubscribed.difference_update(pending)
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._read())
+    
+    async def unsubscribe(self, execution_id: str | UUID, queue: asyncio.Queue):
+        """Stop delivering events for an execution into ``queue``."""
+        execution_id = str(execution_id)
+        queues = self._queues.get(execution_id)
+        if queues is None:
+            return
+        
+        queues.discard(queue)
+        if queues:
+            return
         
-        if self.retry:
-            lines.append(f"retry: {self.retry}")
+        del self._queues[execution_id]
+        self._unsubscribed.discard(execution_id)
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.unsubscribe(self.channel(execution_id))
+            except Exception as e:
+                logger.warning(f"Redis unsubscribe failed for execution {execution_id}: {e}")
+    
+    def _dispatch(self, execution_id: str, event: StreamEvent):
+        """Hand an event to every local queue following the execution."""
+        for queue in tuple(self._queues.get(execution_id, ())):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logger.warning(f"Queue full for execution {execution_id}")
+    
+    async def _read(self):
+        """Single reader for the shared SUBSCRIBE connection."""
+        prefix = len(self.channel(''))
         
-        # SSE messages end with double newline
-        return '\n'.join(lines) + '\n\n'
+        while self._queues:
+            try:
+                # listen() returns once every channel has been unsubscribed
+                async for message in self._pubsub.listen():
+                    if message.get('type') != 'message':
+                        continue
+                    execution_id = message['channel'].decode()[prefix:]
+                    # Decoded once per process; local subscribers share the event
+                    self._dispatch(execution_id, StreamEvent(**orjson.loads(message['data'])))
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Redis subscription lost, reconnecting: {e}")
+                await asyncio.sleep(self.REDIS_RETRY_SECONDS)
+                try:
+                    self._pubsub = self.redis.pubsub() if self.redis else None
+                    if self._pubsub is None:
+                        self._unsubscribed.update(self._queues)
+                        return
+                    followed = tuple(self._queues)
+                    if followed:
+                        await self._pubsub.subscribe(*(self.channel(e) for e in followed))
+                    self._unsubscribed.difference_update(followed)
+                except Exception as e:
+                    self._redis_failed('resubscribe', e)
+                    self._pubsub = None
+                    # Retried by _subscribe_pending() once Redis is back
+                    self._unsubscribed.update(self._queues)
+                    return
+
+
+# Per-process hub instance
+_hub: Optional[ExecutionEventHub] = None
+
+
+def get_event_hub() -> ExecutionEventHub:
+    """Get the process-wide execution event hub."""
+    global _hub
+    if _hub is None:
+        _hub = ExecutionEventHub()
+    return _hub
 
 
 class SSEBroadcaster:
     """
     Server-Sent Events broadcaster for execution updates.
     
-    Supports multi-instance deployment via Redis pub/sub (when configured).
-    For single instance, uses in-memory queues.
+    Events are fanned out through the process-wide ExecutionEventHub, which
+    uses Redis pub/sub for multi-instance deployment and in-memory delivery
+    for a single instance.
     """
     
     # Event types
@@ -91,23 +313,9 @@ class SSEBroadcaster:
     EVENT_ORCHESTRATOR_THOUGHT = 'thought'
     EVENT_WORKFLOW_CANCELLED = 'workflow_cancelled'
     
-    # In-memory subscribers (for single instance)
-    # Format: {execution_id: [asyncio.Queue, ...]}
-    _subscribers: dict[str, list[asyncio.Queue]] = {}
-    _lock = asyncio.Lock()
-    
-    def __init__(self):
-        self._channel_layer = None
-    
     @property
-    def channel_layer(self):
-        """Get Django Channels layer (lazy load)."""
-        if self._channel_layer is None:
-            try:
-                self._channel_layer = get_channel_layer()
-            except Exception:
-                self._channel_layer = None
-        return self._channel_layer
+    def hub(self) -> ExecutionEventHub:
+        return get_event_hub()
     
     async def send_event(
         self,
@@ -125,47 +333,22 @@ class SSEBroadcaster:
             data: Event payload
             event_id: Optional event ID for client replay
         """
-        execution_id = str(execution_id)
         event = StreamEvent(
             event_type=event_type,
             data=data,
             id=event_id,
         )
+        await self.hub.publish(execution_id, event)
+    
+    async def flush(self, batched: list[tuple[str, StreamEvent]]):
+        """
+        Publish a burst of events in a single Redis round-trip.
         
-        # Try Channels first (for multi-instance)
-        if self.channel_layer:
-            try:
-                await self.channel_layer.group_send(
-                    f"execution_{execution_id}",
-                    {
-                        "type": "execution.event",
-                        "event": asdict(event),
-                    }
-                )
-                return
-            except Exception as e:
-                logger.warning(f"Channel layer send failed: {e}")
-        
-        # Fallback to in-memory queue
-        await self._send_to_memory_subscribers(execution_id, event)
-    
-    async def _send_to_memory_subscribers(self, execution_id: str, event: StreamEvent):
-        """Send event to in-memory subscribers."""
-        async with self._lock:
-            subscribers = self._subscribers.get(execution_id, [])
-            dead_queues = []
-            
-            for queue in subscribers:
-                try:
-                    queue.put_nowait(event)
-                except asyncio.QueueFull:
-                    logger.warning(f"Queue full for execution {execution_id}")
-                except Exception:
-                    dead_queues.append(queue)
-            
-            # Remove dead queues
-            for queue in dead_queues:
-                subscribers.remove(queue)
+        Args:
+            batched: List of (execution_id, event) pairs, in emission order
+        """
+        if batched:
+            await self.hub.publish_many(batched)
     
     async def subscribe(self, execution_id: str | UUID) -> asyncio.Queue:
         """
@@ -173,39 +356,22 @@ class SSEBroadcaster:
         
         Returns an asyncio.Queue that will receive events.
         """
-        execution_id = str(execution_id)
         queue = asyncio.Queue(maxsize=100)
-        
-        async with self._lock:
-            if execution_id not in self._subscribers:
-                self._subscribers[execution_id] = []
-            self._subscribers[execution_id].append(queue)
-        
+        await self.hub.subscribe(execution_id, queue)
         return queue
     
     async def unsubscribe(self, execution_id: str | UUID, queue: asyncio.Queue):
         """Unsubscribe from an execution's events."""
-        execution_id = str(execution_id)
-        
-        async with self._lock:
-            if execution_id in self._subscribers:
-                try:
-                    self._subscribers[execution_id].remove(queue)
-                except ValueError:
-                    pass
-                
-                # Clean up empty lists
-                if not self._subscribers[execution_id]:
-                    del self._subscribers[execution_id]
+        await self.hub.unsubscribe(execution_id, queue)
     
     async def stream_execution(
         self,
         execution_id: str | UUID,
         timeout: float = 300,  # 5 minutes
         heartbeat_interval: float = 30
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncGenerator[bytes, None]:
         """
-        Stream events for an execution as formatted SSE messages.
+        Stream events for an execution as encoded SSE messages.
         
         Args:
             execution_id: UUID of the execution
@@ -213,8 +379,9 @@ class SSEBroadcaster:
             heartbeat_interval: Seconds between heartbeat messages
             
         Yields:
-            Formatted SSE message strings
+            SSE messages as bytes (shared across subscribers of an event)
         """
+        loop = asyncio.get_running_loop()
         execution_id = str(execution_id)
         queue = await self.subscribe(execution_id)
         
@@ -223,38 +390,33 @@ class SSEBroadcaster:
             yield StreamEvent(
                 event_type='connected',
                 data={'execution_id': execution_id}
-            ).format_sse()
+            ).encode_sse()
             
-            end_time = asyncio.get_event_loop().time() + timeout
-            last_heartbeat = asyncio.get_event_loop().time()
+            end_time = loop.time() + timeout
+            last_heartbeat = loop.time()
             
-            while asyncio.get_event_loop().time() < end_time:
+            while loop.time() < end_time:
                 try:
                     # Wait for event with heartbeat timeout
-                    event = await asyncio.wait_for(
-                        queue.get(),
-                        timeout=heartbeat_interval
-                    )
-                    
-                    yield event.format_sse()
-                    
-                    # Check for terminal events
-                    if event.event_type in (
-                        self.EVENT_WORKFLOW_COMPLETE,
-                        self.EVENT_WORKFLOW_ERROR,
-                        self.EVENT_WORKFLOW_CANCELLED
-                    ):
-                        break
-                        
+                    async with asyncio.timeout_at(loop.time() + heartbeat_interval):
+                        event = await queue.get()
                 except asyncio.TimeoutError:
                     # Send heartbeat
-                    current_time = asyncio.get_event_loop().time()
+                    current_time = loop.time()
                     if current_time - last_heartbeat >= heartbeat_interval:
-                        yield StreamEvent(
-                            event_type='heartbeat',
-                            data={}
-                        ).format_sse()
+                        yield SSE_HEARTBEAT
                         last_heartbeat = current_time
+                    continue
+                
+                yield event.encode_sse()
+                
+                # Check for terminal events
+                if event.event_type in (
+                    self.EVENT_WORKFLOW_COMPLETE,
+                    self.EVENT_WORKFLOW_ERROR,
+                    self.EVENT_WORKFLOW_CANCELLED
+                ):
+                    break
                         
         finally:
             await self.unsubscribe(execution_id, queue)
@@ -14,36 +14,161 @@ Usage:
     # Respond to HITL
     ws.send(JSON.stringify({type: 'hitl_response', request_id: '...', response: {...}}));
 """
-import json
+import asyncio
 import logging
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
 from uuid import UUID
 from typing import Optional
 
+import orjson
+from asgiref.sync import sync_to_async
+from cachetools import TTLCache
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.utils import timezone
 
+from workflow_backend.thresholds import (
+    WS_BATCH_MAX_EVENTS,
+    WS_BATCH_WINDOW_SECONDS,
+    WS_OUTBOUND_QUEUE_SIZE,
+    EXECUTION_ACCESS_CACHE_SIZE,
+    EXECUTION_ACCESS_CACHE_TTL_SECONDS,
+)
+from . import hitl_state
+from .broadcaster import StreamEvent, get_event_hub
+from .utils import dumps, get_shared_channel_layer, packb, unpackb
+
 logger = logging.getLogger(__name__)
 
+# Clients that offer this subprotocol get binary msgpack frames instead of JSON text
+MSGPACK_SUBPROTOCOL = 'msgpack'
+
+# execution_id -> owner user_id, so repeat connects/subscribes skip the DB.
+# Invalidated from streaming.signals when an ExecutionLog is saved or deleted;
+# the lock is a threading one because signals fire from sync worker threads.
+_execution_owners: TTLCache = TTLCache(
+    maxsize=EXECUTION_ACCESS_CACHE_SIZE,
+    ttl=EXECUTION_ACCESS_CACHE_TTL_SECONDS,
+)
+_execution_owners_lock = threading.Lock()
+
+# HITL ack frames are formatted straight into JSON bytes; request_id is a
+# parsed UUID and status one of two literals, so no escaping is needed.
+_ACK_TMPL = b'{"type":"hitl_response_ack","data":{"request_id":"%s","status":"%s"}}'
+_MISSING_FIELDS_ERROR = dumps({'type': 'error', 'error': 'Missing request_id or response'}).decode()
+_INVALID_REQUEST_ERROR = dumps({'type': 'error', 'error': 'Invalid request_id'}).decode()
+_HITL_FAILED_ERROR = dumps({'type': 'error', 'error': 'Failed to process HITL response'}).decode()
+
+# [epoch seconds, ISO string] of the last formatted timestamp
+_TS_CACHE = [0.0, '']
+
+
+def _now_iso() -> str:
+    """UTC ISO timestamp, reformatted at most once per millisecond."""
+    t = time.time()
+    if t - _TS_CACHE[0] > 0.001:
+        _TS_CACHE[0] = t
+        _TS_CACHE[1] = datetime.fromtimestamp(t, dt_timezone.utc).replace(tzinfo=None).isoformat()
+    return _TS_CACHE[1]
+
+
+def invalidate_execution_access(execution_id) -> None:
+    """Forget the cached owner of an execution."""
+    with _execution_owners_lock:
+        _execution_owners.pop(str(execution_id), None)
+
+
+@database_sync_to_async
+def _save_hitl_response_to_db(user_id: int, request_id: str, status: str, response) -> bool:
+    """Save HITL response directly through the ORM."""
+    from orchestrator.models import HITLRequest
+    
+    try:
+        hitl_request = HITLRequest.objects.get(
+            request_id=request_id,
+            user_id=user_id,
+            status='pending'
+        )
+    except HITLRequest.DoesNotExist:
+        logger.warning("HITL request not found or not pending: %s", request_id)
+        return False
+    
+    hitl_request.status = status
+    hitl_request.response = response
+    hitl_request.responded_at = timezone.now()
+    hitl_request.save()
+    return True
+
+
+async def save_hitl_response(user_id: int, request_id: str, response) -> bool:
+    """
+    Record a user's HITL response.
+    
+    Tries the Redis compare-and-set first and defers the Postgres write to
+    Celery; requests without Redis state go straight to the ORM.
+    """
+    status = hitl_state.hitl_status_for(response)
+    answered = await hitl_state.answer(request_id, user_id, status, response)
+    
+    if answered is None:
+        return await _save_hitl_response_to_db(user_id, request_id, status, response)
+    
+    if answered:
+        from executor.tasks import persist_hitl_response
+        try:
+            # Publishing to the broker is blocking I/O
+            await sync_to_async(persist_hitl_response.delay, thread_sensitive=False)(
+                str(request_id), user_id, status, response
+            )
+        except Exception as e:
+            logger.warning("Could not queue HITL persist for %s, saving inline: %s", request_id, e)
+            await _save_hitl_response_to_db(user_id, request_id, status, response)
+    
+    return answered
+
+
+@database_sync_to_async
+def _get_execution_id(request_id: str) -> Optional[str]:
+    """Get execution ID of a HITL request in a single column fetch."""
+    from orchestrator.models import HITLRequest
+    
+    execution_id = HITLRequest.objects.filter(
+        request_id=request_id
+    ).values_list('execution__execution_id', flat=True).first()
+    return str(execution_id) if execution_id else None
+
+
+async def notify_execution_resume(request_id: str, response) -> None:
+    """Hand an accepted HITL response to the approval gate waiting on it."""
+    execution_id = await _get_execution_id(request_id)
+    if execution_id:
+        await hitl_state.publish_resume(execution_id, request_id, response)
+
 
 class ExecutionConsumer(AsyncWebsocketConsumer):
     """
     WebSocket consumer for execution updates and HITL.
     
-    Groups:
-        - execution_{execution_id}: Execution-specific events
-        - user_{user_id}: User-wide notifications
+    Subscriptions:
+        - execution events: via the process-wide ExecutionEventHub
+          (Redis channel execution:{execution_id})
+        - user_{user_id} group: User-wide notifications
     
     Message types (server -> client):
         - execution.event: Node/workflow events
         - hitl.request: HITL approval/clarification needed
         - error: Error notifications
+        - batch: Several of the above coalesced into one frame ({'events': [...]})
     
     Message types (client -> server):
         - hitl_response: Response to HITL request
         - subscribe: Subscribe to additional executions
         - unsubscribe: Unsubscribe from execution
+    
+    Frames are JSON text unless the client offers the 'msgpack' subprotocol,
+    in which case both directions use binary msgpack frames.
     """
     
     def __init__(self, *args, **kwargs):
@@ -51,24 +176,37 @@ class ExecutionConsumer(AsyncWebsocketConsumer):
         self.execution_id: Optional[str] = None
         self.user_id: Optional[int] = None
         self.groups: list[str] = []
+        self.executions: set[str] = set()
+        # Bounded so a stalled client cannot grow memory without limit;
+        # the hub and _enqueue() drop events once it is full
+        self._outbound: asyncio.Queue = asyncio.Queue(maxsize=WS_OUTBOUND_QUEUE_SIZE)
+        self._flusher: Optional[asyncio.Task] = None
+        self._use_msgpack = False
     
     async def connect(self):
         """Handle WebSocket connection request."""
         # Get execution_id from URL
         self.execution_id = self.scope['url_route']['kwargs'].get('execution_id')
         
-        await self.accept() # Accept first to avoid HTTP 403 drops
+        # Accept first to avoid HTTP 403 drops
+        if MSGPACK_SUBPROTOCOL in self.scope.get('subprotocols', ()):
+            self._use_msgpack = True
+            await self.accept(subprotocol=MSGPACK_SUBPROTOCOL)
+        else:
+            await self.accept()
         
-        # Get user from scope
-        user = self.scope.get('user')
-        if not user or not user.is_authenticated:
-            logger.error(f"Execution WS CONNECTION REJECTED. User in scope: {user}")
+        # Auth state is resolved once by JWTAuthMiddleware
+        if not self.scope.get('authenticated'):
+            logger.error("Execution WS CONNECTION REJECTED. User in scope: %s", self.scope.get('user'))
             # Reject unauthenticated connections
             await self.close(code=4001)
             return
         
-        self.user_id = user.pk
-        logger.info(f"Execution WS CONNECTION ACCEPTED for User ID: {self.user_id}, Execution: {self.execution_id}")
+        self.user_id = self.scope['user_id']
+        logger.info("Execution WS CONNECTION ACCEPTED for User ID: %s, Execution: %s", self.user_id, self.execution_id)
+        
+        # Hub and channel-layer events are coalesced into batched frames
+        self._flusher = asyncio.create_task(self._flush_outbound())
         
         # Verify user has access to this execution
         if self.execution_id:
@@ -77,16 +215,14 @@ class ExecutionConsumer(AsyncWebsocketConsumer):
                 await self.close(code=4003)
                 return
             
-            # Join execution group
-            group_name = f"execution_{self.execution_id}"
-            await self.channel_layer.group_add(group_name, self.channel_name)
-            self.groups.append(group_name)
+            # Follow execution events
+            await get_event_hub().subscribe(self.execution_id, self._outbound)
+            self.executions.add(self.execution_id)
         
         # Join user group (for user-wide notifications)
-        user_group = f"user_{self.user_id}"
-        await self.channel_layer.group_add(user_group, self.channel_name)
-        self.groups.append(user_group)
-        
+        self.groups.append(f"user_{self.user_id}")
+        for group in self.groups:
+            await self.channel_layer.group_add(group, self.channel_name)
         
         # Send connection confirmation
         await self.send_json({
@@ -94,7 +230,7 @@ class ExecutionConsumer(AsyncWebsocketConsumer):
             'data': {
                 'execution_id': self.execution_id,
                 'user_id': self.user_id,
-                'timestamp': datetime.utcnow().isoformat(),
+                'timestamp': _now_iso(),
             }
         })
         
@@ -103,9 +239,9 @@ class ExecutionConsumer(AsyncWebsocketConsumer):
             try:
                 await self._send_initial_state(self.execution_id)
             except Exception as e:
-                logger.error(f"Error sending initial state for {self.execution_id}: {e}")
+                logger.error("Error sending initial state for %s: %s", self.execution_id, e)
         
-        logger.info(f"WebSocket connected: user={self.user_id}, execution={self.execution_id}")
+        logger.info("WebSocket connected: user=%s, execution=%s", self.user_id, self.execution_id)
 
     async def _send_initial_state(self, execution_id: str):
         """Send the current state of all nodes for this execution."""
@@ -137,48 +273,46 @@ class ExecutionConsumer(AsyncWebsocketConsumer):
                         'nodes': initial_state
                     }
                 })
-                logger.info(f"Sent initial state sync for execution {execution_id} with {len(initial_state)} nodes")
+                logger.info("Sent initial state sync for execution %s with %d nodes", execution_id, len(initial_state))
         except ExecutionLog.DoesNotExist:
-            logger.warning(f"Initial state sync failed: Execution {execution_id} not found")
-        except Exception as e:
-            logger.exception(f"Error in _send_initial_state: {e}")
+            logger.warning("Initial state sync failed: Execution %s not found", execution_id)
+        except Exception:
+            logger.exception("Error in _send_initial_state")
 
     
     async def disconnect(self, close_code):
         """Handle WebSocket disconnection."""
+        if self._flusher:
+            self._flusher.cancel()
+        
+        hub = get_event_hub()
+        for execution_id in self.executions:
+            await hub.unsubscribe(execution_id, self._outbound)
+        
         # Leave all groups
-        for group_name in self.groups:
-            await self.channel_layer.group_discard(group_name, self.channel_name)
+        for group in self.groups:
+            await self.channel_layer.group_discard(group, self.channel_name)
         
-        logger.info(f"WebSocket disconnected: user={self.user_id}, code={close_code}")
+        logger.info("WebSocket disconnected: user=%s, code=%s", self.user_id, close_code)
     
-    async def receive(self, text_data):
+    async def receive(self, text_data=None, bytes_data=None):
         """Handle incoming WebSocket messages."""
         try:
-            data = json.loads(text_data)
-            message_type = data.get('type')
-            
-            if message_type == 'hitl_response':
-                await self._handle_hitl_response(data)
-            elif message_type == 'subscribe':
-                await self._handle_subscribe(data)
-            elif message_type == 'unsubscribe':
-                await self._handle_unsubscribe(data)
-            elif message_type == 'ping':
-                await self.send_json({'type': 'pong', 'timestamp': datetime.utcnow().isoformat()})
+            if bytes_data is not None:
+                data = unpackb(bytes_data)
             else:
-                await self.send_json({
-                    'type': 'error',
-                    'error': f'Unknown message type: {message_type}'
-                })
+                data = orjson.loads(text_data)
+            handler = self._HANDLERS.get(data.get('type'), ExecutionConsumer._handle_unknown)
+            await handler(self, data)
                 
-        except json.JSONDecodeError:
+        except (orjson.JSONDecodeError, ValueError):
+            # msgpack's unpack errors are ValueError subclasses
             await self.send_json({
                 'type': 'error',
-                'error': 'Invalid JSON'
+                'error': 'Invalid message encoding'
             })
-        except Exception as e:
-            logger.exception(f"Error processing WebSocket message: {e}")
+        except Exception:
+            logger.exception("Error processing WebSocket message")
             await self.send_json({
                 'type': 'error',
                 'error': 'Internal error processing message'
@@ -187,7 +321,7 @@ class ExecutionConsumer(AsyncWebsocketConsumer):
     # Handler for execution events (from channel layer)
     async def execution_event(self, event):
         """Handle execution event from channel layer."""
-        await self.send_json({
+        self._enqueue({
             'type': 'execution.event',
             'data': event.get('event', {})
         })
@@ -195,7 +329,7 @@ class ExecutionConsumer(AsyncWebsocketConsumer):
     # Handler for HITL requests (from channel layer)
     async def hitl_request(self, event):
         """Handle HITL request from channel layer."""
-        await self.send_json({
+        self._enqueue({
             'type': 'hitl.request',
             'data': event.get('request', {})
         })
@@ -203,45 +337,95 @@ class ExecutionConsumer(AsyncWebsocketConsumer):
     # Handler for notifications (from channel layer)
     async def notification(self, event):
         """Handle notification from channel layer."""
-        await self.send_json({
+        self._enqueue({
             'type': 'notification',
             'data': event.get('data', {})
         })
     
+    def _enqueue(self, message: dict):
+        """Queue a channel-layer message for sending; dropped if the client is not keeping up."""
+        try:
+            self._outbound.put_nowait(message)
+        except asyncio.QueueFull:
+            logger.warning(
+                "WebSocket outbound queue full, dropping %s for user=%s", message['type'], self.user_id
+            )
+    
+    async def _flush_outbound(self):
+        """
+        Send queued hub/channel-layer events, coalescing bursts into one frame.
+        
+        A lone event is sent as-is so idle streams see no added latency.
+        When more events are already waiting, keep collecting for up to
+        WS_BATCH_WINDOW_SECONDS (or WS_BATCH_MAX_EVENTS) and send a single
+        {'type': 'batch', 'events': [...]} frame.
+        """
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            batch = [await self._outbound.get()]
+            deadline = loop.time() + WS_BATCH_WINDOW_SECONDS
+            
+            while len(batch) < WS_BATCH_MAX_EVENTS:
+                try:
+                    batch.append(self._outbound.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                
+                remaining = deadline - loop.time()
+                if len(batch) == 1 or remaining <= 0:
+                    break
+                try:
+                    async with asyncio.timeout(remaining):
+                        batch.append(await self._outbound.get())
+                except asyncio.TimeoutError:
+                    break
+            
+            # Hub deliveries are StreamEvents shared with other subscribers
+            batch = [
+                {'type': 'execution.event', 'data': item.to_dict()}
+                if isinstance(item, StreamEvent) else item
+                for item in batch
+            ]
+            
+            try:
+                if len(batch) == 1:
+                    await self.send_json(batch[0])
+                else:
+                    await self.send_json({'type': 'batch', 'events': batch})
+            except Exception as e:
+                logger.warning("Failed to flush %d WebSocket events: %s", len(batch), e)
+    
     async def _handle_hitl_response(self, data):
         """Process HITL response from client."""
         request_id = data.get('request_id')
         response = data.get('response')
         
         if not request_id or response is None:
-            await self.send_json({
-                'type': 'error',
-                'error': 'Missing request_id or response'
-            })
+            await self._send_prebuilt(_MISSING_FIELDS_ERROR)
+            return
+        
+        try:
+            request_id = str(UUID(str(request_id)))
+        except ValueError:
+            await self._send_prebuilt(_INVALID_REQUEST_ERROR)
             return
         
         # Process the HITL response
         try:
             result = await self._save_hitl_response(request_id, response)
             
-            await self.send_json({
-                'type': 'hitl_response_ack',
-                'data': {
-                    'request_id': request_id,
-                    'status': 'accepted' if result else 'error',
-                }
-            })
+            status = b'accepted' if result else b'error'
+            await self._send_prebuilt((_ACK_TMPL % (request_id.encode(), status)).decode())
             
             # Notify executor to resume (if waiting)
             if result:
-                await self._notify_execution_resume(request_id)
+                await notify_execution_resume(request_id, response)
                 
-        except Exception as e:
-            logger.exception(f"Error saving HITL response: {e}")
-            await self.send_json({
-                'type': 'error',
-                'error': 'Failed to process HITL response'
-            })
+        except Exception:
+            logger.exception("Error saving HITL response")
+            await self._send_prebuilt(_HITL_FAILED_ERROR)
     
     async def _handle_subscribe(self, data):
         """Subscribe to additional execution."""
@@ -263,11 +447,10 @@ class ExecutionConsumer(AsyncWebsocketConsumer):
             })
             return
         
-        # Join group
-        group_name = f"execution_{execution_id}"
-        if group_name not in self.groups:
-            await self.channel_layer.group_add(group_name, self.channel_name)
-            self.groups.append(group_name)
+        # Follow execution events
+        if execution_id not in self.executions:
+            await get_event_hub().subscribe(execution_id, self._outbound)
+            self.executions.add(execution_id)
         
         await self.send_json({
             'type': 'subscribed',
@@ -281,95 +464,75 @@ class ExecutionConsumer(AsyncWebsocketConsumer):
         if not execution_id:
             return
         
-        group_name = f"execution_{execution_id}"
-        if group_name in self.groups:
-            await self.channel_layer.group_discard(group_name, self.channel_name)
-            self.groups.remove(group_name)
+        if execution_id in self.executions:
+            await get_event_hub().unsubscribe(execution_id, self._outbound)
+            self.executions.discard(execution_id)
         
         await self.send_json({
             'type': 'unsubscribed',
             'data': {'execution_id': execution_id}
         })
     
-    @database_sync_to_async
-    def _verify_execution_access(self, execution_id: str) -> bool:
+    async def _handle_ping(self, data):
+        """Reply to a keepalive ping."""
+        await self.send_json({'type': 'pong', 'timestamp': _now_iso()})
+    
+    async def _handle_unknown(self, data):
+        """Reject a message type with no handler."""
+        await self.send_json({
+            'type': 'error',
+            'error': f"Unknown message type: {data.get('type')}"
+        })
+    
+    # Client message type -> handler, looked up once per frame in receive()
+    _HANDLERS = {
+        'hitl_response': _handle_hitl_response,
+        'subscribe': _handle_subscribe,
+        'unsubscribe': _handle_unsubscribe,
+        'ping': _handle_ping,
+    }
+    
+    async def _verify_execution_access(self, execution_id: str) -> bool:
         """Verify user has access to execution."""
-        from logs.models import ExecutionLog
+        key = str(execution_id)
+        with _execution_owners_lock:
+            owner_id = _execution_owners.get(key)
         
-        try:
-            ExecutionLog.objects.get(
-                execution_id=execution_id,
-                user_id=self.user_id
-            )
-            return True
-        except ExecutionLog.DoesNotExist:
-            return False
-    
-    @database_sync_to_async
-    def _save_hitl_response(self, request_id: str, response: dict) -> bool:
-        """Save HITL response to database."""
-        from orchestrator.models import HITLRequest
+        if owner_id is None:
+            owner_id = await self._get_execution_owner(key)
+            if owner_id is None:
+                return False
+            with _execution_owners_lock:
+                _execution_owners[key] = owner_id
         
-        try:
-            hitl_request = HITLRequest.objects.get(
-                request_id=request_id,
-                user_id=self.user_id,
-                status='pending'
-            )
-            
-            # Determine status based on response
-            response_value = response.get('value', response)
-            if response_value in ('approve', 'approved', True):
-                hitl_request.status = 'approved'
-            elif response_value in ('reject', 'rejected', False):
-                hitl_request.status = 'rejected'
-            else:
-                hitl_request.status = 'answered'
-            
-            hitl_request.response = response
-            hitl_request.responded_at = timezone.now()
-            hitl_request.save()
-            
-            return True
-            
-        except HITLRequest.DoesNotExist:
-            logger.warning(f"HITL request not found or not pending: {request_id}")
-            return False
-    
-    async def _notify_execution_resume(self, request_id: str):
-        """Notify executor that HITL response is ready."""
-        # Send to execution-specific channel
-        hitl_request = await self._get_hitl_request(request_id)
-        if hitl_request:
-            execution_id = await self._get_execution_id(hitl_request)
-            if execution_id:
-                await self.channel_layer.group_send(
-                    f"executor_{execution_id}",
-                    {
-                        'type': 'hitl.response_received',
-                        'request_id': request_id,
-                    }
-                )
+        return owner_id == self.user_id
     
     @database_sync_to_async
-    def _get_hitl_request(self, request_id: str):
-        """Get HITL request from database."""
-        from orchestrator.models import HITLRequest
-        try:
-            return HITLRequest.objects.get(request_id=request_id)
-        except HITLRequest.DoesNotExist:
-            return None
+    def _get_execution_owner(self, execution_id: str) -> Optional[int]:
+        """Get the owning user ID of an execution, or None if it does not exist."""
+        from logs.models import ExecutionLog
+        
+        return ExecutionLog.objects.filter(
+            execution_id=execution_id
+        ).values_list('user_id', flat=True).first()
     
-    @database_sync_to_async
-    def _get_execution_id(self, hitl_request) -> Optional[str]:
-        """Get execution ID from HITL request."""
-        if hitl_request and hitl_request.execution:
-            return str(hitl_request.execution.execution_id)
-        return None
+    async def _save_hitl_response(self, request_id: str, response: dict) -> bool:
+        """Save HITL response."""
+        return await save_hitl_response(self.user_id, request_id, response)
     
     async def send_json(self, data: dict):
-        """Send JSON data to client."""
-        await self.send(text_data=json.dumps(data))
+        """Send data to client in the negotiated encoding."""
+        if self._use_msgpack:
+            await self.send(bytes_data=packb(data))
+        else:
+            await self.send(text_data=dumps(data).decode())
+    
+    async def _send_prebuilt(self, text: str):
+        """Send an already-encoded JSON frame, re-encoding it for msgpack clients."""
+        if self._use_msgpack:
+            await self.send(bytes_data=packb(orjson.loads(text)))
+        else:
+            await self.send(text_data=text)
 
 
 class HITLNotificationConsumer(AsyncWebsocketConsumer):
@@ -390,14 +553,13 @@ class HITLNotificationConsumer(AsyncWebsocketConsumer):
         """Handle connection."""
         await self.accept() # Accept first so we don't drop with HTTP 403
         
-        user = self.scope.get('user')
-        if not user or not user.is_authenticated:
-            logger.error(f"WS CONNECTION REJECTED. User in scope: {user}")
+        if not self.scope.get('authenticated'):
+            logger.error("WS CONNECTION REJECTED. User in scope: %s", self.scope.get('user'))
             await self.close(code=4001)
             return
         
-        self.user_id = user.pk
-        logger.info(f"WS CONNECTION ACCEPTED for User ID: {self.user_id}")
+        self.user_id = self.scope['user_id']
+        logger.info("WS CONNECTION ACCEPTED for User ID: %s", self.user_id)
         self.group_name = f"hitl_{self.user_id}"
         
         await self.channel_layer.group_add(self.group_name, self.channel_name)
@@ -420,7 +582,7 @@ class HITLNotificationConsumer(AsyncWebsocketConsumer):
     async def receive(self, text_data):
         """Handle incoming messages."""
         try:
-            data = json.loads(text_data)
+            data = orjson.loads(text_data)
             message_type = data.get('type')
             
             if message_type == 'respond':
@@ -430,6 +592,8 @@ class HITLNotificationConsumer(AsyncWebsocketConsumer):
                 
                 if request_id and response:
                     result = await self._save_hitl_response(request_id, response)
+                    if result:
+                        await notify_execution_resume(request_id, response)
                     await self.send_json({
                         'type': 'response_ack',
                         'data': {
@@ -444,7 +608,7 @@ class HITLNotificationConsumer(AsyncWebsocketConsumer):
                     'data': pending,
                 })
                 
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             await self.send_json({'type': 'error', 'error': 'Invalid JSON'})
     
     async def hitl_new_request(self, event):
@@ -466,54 +630,34 @@ class HITLNotificationConsumer(AsyncWebsocketConsumer):
         """Get pending HITL requests for user."""
         from orchestrator.models import HITLRequest
         
-        requests = HITLRequest.objects.filter(
+        rows = HITLRequest.objects.filter(
             user_id=self.user_id,
             status='pending'
-        ).order_by('-created_at')[:20]
+        ).order_by('-created_at').values_list(
+            'request_id', 'request_type', 'title', 'message', 'options', 'created_at'
+        )[:20]
         
+        # Stringified here so the wire format stays str(uuid) / isoformat()
+        # (+00:00), not orjson's native encoding (Z suffix)
         return [
             {
-                'request_id': str(r.request_id),
-                'type': r.request_type,
-                'title': r.title,
-                'message': r.message,
-                'options': r.options,
-                'created_at': r.created_at.isoformat(),
+                'request_id': str(request_id),
+                'type': request_type,
+                'title': title,
+                'message': message,
+                'options': options,
+                'created_at': created_at.isoformat(),
             }
-            for r in requests
+            for request_id, request_type, title, message, options, created_at in rows
         ]
     
-    @database_sync_to_async
-    def _save_hitl_response(self, request_id: str, response: dict) -> bool:
+    async def _save_hitl_response(self, request_id: str, response: dict) -> bool:
         """Save HITL response."""
-        from orchestrator.models import HITLRequest
-        
-        try:
-            hitl_request = HITLRequest.objects.get(
-                request_id=request_id,
-                user_id=self.user_id,
-                status='pending'
-            )
-            
-            response_value = response.get('value', response)
-            if response_value in ('approve', 'approved', True):
-                hitl_request.status = 'approved'
-            elif response_value in ('reject', 'rejected', False):
-                hitl_request.status = 'rejected'
-            else:
-                hitl_request.status = 'answered'
-            
-            hitl_request.response = response
-            hitl_request.responded_at = timezone.now()
-            hitl_request.save()
-            
-            return True
-        except HITLRequest.DoesNotExist:
-            return False
+        return await save_hitl_response(self.user_id, request_id, response)
     
     async def send_json(self, data: dict):
         """Send JSON data."""
-        await self.send(text_data=json.dumps(data))
+        await self.send(text_data=dumps(data).decode())
 
 
 # Helper function to send HITL request to user via WebSocket
@@ -525,9 +669,7 @@ async def send_hitl_request_to_user(user_id: int, request_data: dict):
         user_id: User to notify
         request_data: HITL request details
     """
-    from channels.layers import get_channel_layer
-    
-    channel_layer = get_channel_layer()
+    channel_layer = get_shared_channel_layer()
     if channel_layer:
         await channel_layer.group_send(
             f"hitl_{user_id}",
@@ -536,25 +678,3 @@ async def send_hitl_request_to_user(user_id: int, request_data: dict):
                 'request': request_data,
             }
         )
-
-
-# Helper function to broadcast execution event
-async def broadcast_execution_event(execution_id: str, event_data: dict):
-    """
-    Broadcast execution event to all subscribers.
-    
-    Args:
-        execution_id: Execution UUID
-        event_data: Event details
-    """
-    from channels.layers import get_channel_layer
-    
-    channel_layer = get_channel_layer()
-    if channel_layer:
-        await channel_layer.group_send(
-            f"execution_{execution_id}",
-            {
-                'type': 'execution.event',
-                'event': event_data,
-            }
-        )
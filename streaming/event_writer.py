@@ -0,0 +1,233 @@
+"""
+Stream Event Writer - Batched persistence of broadcast events
+
+Events published through the ExecutionEventHub are queued here and
+written to ``streaming_streamevent`` by a background thread in batches
+(up to STREAM_EVENT_WRITE_BATCH_SIZE rows, or whatever arrived within
+STREAM_EVENT_WRITE_WINDOW_SECONDS). On PostgreSQL a batch is a single
+COPY; other backends use bulk_create.
+
+Event UUIDs and timestamps are generated client-side, so nothing is read
+back from the inserts. Sequence numbers are assigned in the write
+transaction (see _last_sequences): the ASGI process and Celery workers
+both publish events for the same execution, so no process-local counter
+can number them. A thread is used rather than
+an asyncio task because Celery drives executions through a fresh
+asyncio.run() loop per task, which would take a loop-bound writer with it.
+"""
+import atexit
+import csv
+import io
+import logging
+import queue
+import threading
+import time
+import uuid
+from typing import Optional
+
+import orjson
+from cachetools import LRUCache
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from workflow_backend.thresholds import (
+    STREAM_EVENT_WRITE_BATCH_SIZE,
+    STREAM_EVENT_WRITE_WINDOW_SECONDS,
+    EXECUTION_ACCESS_CACHE_SIZE,
+)
+from .utils import dumps
+
+logger = logging.getLogger(__name__)
+
+_COPY_SQL = (
+    "COPY streaming_streamevent "
+    "(event_id, execution_id, user_id, event_type, node_id, data, sequence, created_at) "
+    "FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL (node_id))"
+)
+
+
+class StreamEventWriter:
+    """Buffers broadcast events and writes them to the database in batches."""
+
+    def __init__(self):
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        # Serializes the background thread with an atexit flush()
+        self._write_lock = threading.Lock()
+        # execution_id -> (ExecutionLog pk, user_id)
+        self._executions: LRUCache = LRUCache(maxsize=EXECUTION_ACCESS_CACHE_SIZE)
+
+    def record(self, execution_id, event) -> None:
+        """Queue a broadcast StreamEvent for persistence."""
+        self._queue.put((str(execution_id), event, timezone.now()))
+        if self._thread is None:
+            self._start()
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='stream-event-writer', daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + STREAM_EVENT_WRITE_WINDOW_SECONDS
+            while len(batch) < STREAM_EVENT_WRITE_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def flush(self) -> None:
+        """Write everything queued so far on the calling thread."""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+            if len(batch) == STREAM_EVENT_WRITE_BATCH_SIZE:
+                self._write(batch)
+                batch = []
+        if batch:
+            self._write(batch)
+
+    def _resolve(self, execution_ids: set[str]) -> None:
+        """Load pk and owner for unseen executions."""
+        from logs.models import ExecutionLog
+
+        missing = [e for e in execution_ids if e not in self._executions]
+        if not missing:
+            return
+
+        rows = ExecutionLog.objects.filter(execution_id__in=missing).values_list(
+            'execution_id', 'id', 'user_id'
+        )
+        for execution_id, pk, user_id in rows:
+            self._executions[str(execution_id)] = (pk, user_id)
+
+    @staticmethod
+    def _last_sequences(pks: set[int]) -> dict[int, int]:
+        """
+        Lock the executions' log rows and read their last persisted sequence.
+
+        Must run inside the write transaction. Writers in other processes
+        block on the same row locks until this batch commits, so sequences
+        are unique per execution and become visible in increasing order,
+        which after_sequence replay relies on.
+        """
+        from logs.models import ExecutionLog
+        from .models import StreamEvent as StreamEventModel
+
+        # Locked in pk order so writers covering several executions cannot deadlock
+        list(
+            ExecutionLog.objects.select_for_update()
+            .filter(pk__in=pks).order_by('pk').values_list('pk')
+        )
+        return dict(
+            StreamEventModel.objects.filter(execution_id__in=pks)
+            .order_by()
+            .values('execution_id')
+            .annotate(last=Max('sequence'))
+            .values_list('execution_id', 'last')
+        )
+
+    def _write(self, batch: list) -> None:
+        with self._write_lock:
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: list) -> None:
+        try:
+            close_old_connections()
+            self._resolve({execution_id for execution_id, _, _ in batch})
+
+            events = []
+            for execution_id, event, created_at in batch:
+                known = self._executions.get(execution_id)
+                if known is not None:
+                    events.append((known, event, created_at))
+            if not events:
+                return
+
+            with transaction.atomic():
+                sequences = self._last_sequences({pk for (pk, _), _, _ in events})
+                rows = []
+                for (pk, user_id), event, created_at in events:
+                    sequences[pk] = sequences.get(pk, 0) + 1
+                    data = event.data if isinstance(event.data, dict) else {'value': event.data}
+                    rows.append((
+                        uuid.uuid4(), pk, user_id, event.event_type[:30],
+                        str(data.get('node_id') or '')[:100], data, sequences[pk], created_at,
+                    ))
+
+                if connection.vendor == 'postgresql':
+                    self._copy(rows)
+                else:
+                    self._bulk_create(rows)
+        except Exception as e:
+            logger.error(f"Failed to persist {len(batch)} stream events: {e}")
+
+    @staticmethod
+    def _copy_buffer(rows: list) -> io.StringIO:
+        """
+        Encode rows as COPY CSV input.
+
+        csv writes an empty node_id as an unquoted empty field, which COPY
+        reads as NULL; _COPY_SQL forces it back to '' for the NOT NULL column.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for event_id, pk, user_id, event_type, node_id, data, sequence, created_at in rows:
+            writer.writerow((
+                event_id, pk, user_id, event_type, node_id,
+                dumps(data).decode(), sequence, created_at.isoformat(),
+            ))
+        buffer.seek(0)
+        return buffer
+
+    @classmethod
+    def _copy(cls, rows: list) -> None:
+        with connection.cursor() as cursor:
+            cursor.cursor.copy_expert(_COPY_SQL, cls._copy_buffer(rows))
+
+    @staticmethod
+    def _bulk_create(rows: list) -> None:
+        from .models import StreamEvent as StreamEventModel
+
+        # data is round-tripped through orjson so datetimes/UUIDs are stored as broadcast
+        events = StreamEventModel.objects.bulk_create([
+            StreamEventModel(
+                event_id=event_id, execution_id=pk, user_id=user_id, event_type=event_type,
+                node_id=node_id, data=orjson.loads(dumps(data)), sequence=sequence,
+            )
+            for event_id, pk, user_id, event_type, node_id, data, sequence, created_at in rows
+        ])
+
+        # created_at is auto_now_add, so the insert stamped it with the write
+        # time; restore the time each event was recorded. SQLite returns the
+        # new pks from bulk_create, which bulk_update needs.
+        for event, row in zip(events, rows):
+            event.created_at = row[-1]
+        StreamEventModel.objects.bulk_update(events, ['created_at'])
+
+
+# Per-process writer instance
+_writer: Optional[StreamEventWriter] = None
+
+
+def get_event_writer() -> StreamEventWriter:
+    """Get the process-wide stream event writer."""
+    global _writer
+    if _writer is None:
+        _writer = StreamEventWriter()
+    return _writer
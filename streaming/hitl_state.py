@@ -0,0 +1,170 @@
+"""
+HITL Response State - Redis fast path for human-in-the-loop answers
+
+Pending HITL requests are mirrored into a Redis hash ``hitl:{request_id}``
+(``status``, ``user_id``) when they are created. A response then flips
+``pending`` -> answered with one atomic Lua compare-and-set, and the
+Postgres row is updated afterwards by a Celery task.
+
+Requests with no Redis state (Redis down, key expired, or created before
+the mirror existed) return ``None`` so callers fall back to the ORM path.
+Any other status change of the Postgres row (REST answer, gate completion,
+timeout) clears the key, so a late answer takes that ORM path and is
+rejected there.
+
+Accepted answers are published on ``hitl_resume:{execution_id}``, where
+the waiting ApprovalGate picks them up (wait_for_response).
+"""
+import hashlib
+import logging
+from typing import Any, Optional
+
+import orjson
+import redis
+from django.conf import settings
+from redis.exceptions import NoScriptError
+
+from .utils import dumps, get_redis
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] = hitl:{request_id}
+# ARGV    = user_id, new status, response JSON
+# Returns -1 if there is no state, 0 if not pending / not the owner, 1 on success.
+_LUA_CAS = """
+local status = redis.call('HGET', KEYS[1], 'status')
+if not status then
+    return -1
+end
+if status ~= 'pending' or redis.call('HGET', KEYS[1], 'user_id') ~= ARGV[1] then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'status', ARGV[2], 'response', ARGV[3])
+return 1
+"""
+
+_LUA_CAS_SHA = hashlib.sha1(_LUA_CAS.encode()).hexdigest()
+
+
+_sync_redis: Optional[redis.Redis] = None
+
+
+def _key(request_id) -> str:
+    return f"hitl:{request_id}"
+
+
+def _resume_channel(execution_id) -> str:
+    return f"hitl_resume:{execution_id}"
+
+
+def hitl_status_for(response: Any) -> str:
+    """Map a user response to the resulting HITLRequest status."""
+    response_value = response.get('value', response) if isinstance(response, dict) else response
+    if response_value in ('approve', 'approved', True):
+        return 'approved'
+    if response_value in ('reject', 'rejected', False):
+        return 'rejected'
+    return 'answered'
+
+
+async def mark_pending(request_id, user_id: int, timeout_seconds: int) -> None:
+    """Mirror a newly created pending request into Redis until it times out."""
+    try:
+        key = _key(request_id)
+        pipe = get_redis().pipeline(transaction=True)
+        pipe.hset(key, mapping={'status': 'pending', 'user_id': str(user_id)})
+        pipe.expire(key, timeout_seconds)
+        await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to mirror HITL request {request_id} to Redis: {e}")
+
+
+async def answer(request_id, user_id: int, status: str, response: Any) -> Optional[bool]:
+    """
+    Atomically record a response if the request is still pending.
+
+    Returns:
+        True if recorded, False if not pending or not owned by the user,
+        None if Redis has no state for the request.
+    """
+    try:
+        client = get_redis()
+        args = (_key(request_id), str(user_id), status, dumps(response))
+        try:
+            result = await client.evalsha(_LUA_CAS_SHA, 1, *args)
+        except NoScriptError:
+            result = await client.eval(_LUA_CAS, 1, *args)
+    except Exception as e:
+        logger.warning(f"Redis HITL CAS failed for {request_id}: {e}")
+        return None
+
+    if result == -1:
+        return None
+    return result == 1
+
+
+async def clear(request_id) -> None:
+    """Drop the Redis state of a request whose row is no longer pending."""
+    try:
+        await get_redis().delete(_key(request_id))
+    except Exception as e:
+        logger.warning(f"Failed to clear Redis HITL state for {request_id}: {e}")
+
+
+def clear_sync(request_ids) -> None:
+    """clear() for synchronous callers (Celery tasks), for several requests at once."""
+    global _sync_redis
+    keys = [_key(request_id) for request_id in request_ids]
+    if not keys:
+        return
+    try:
+        if _sync_redis is None:
+            _sync_redis = redis.from_url(settings.REDIS_URL)
+        _sync_redis.delete(*keys)
+    except Exception as e:
+        logger.warning(f"Failed to clear Redis HITL state for {len(keys)} requests: {e}")
+
+
+async def publish_resume(execution_id, request_id, response: Any) -> None:
+    """Tell executors waiting on an execution that a HITL response is in."""
+    try:
+        await get_redis().publish(
+            _resume_channel(execution_id),
+            dumps({'request_id': str(request_id), 'response': response})
+        )
+    except Exception as e:
+        logger.warning(f"Failed to publish HITL resume for {execution_id}: {e}")
+
+
+async def wait_for_response(execution_id, request_id) -> Any:
+    """
+    Wait until a response to the request is published.
+
+    Subscribes first and then reads the hash, so an answer recorded before
+    the subscription took effect is not missed.
+
+    Returns:
+        The response, or None if Redis is unavailable.
+    """
+    pubsub = get_redis().pubsub()
+    try:
+        await pubsub.subscribe(_resume_channel(execution_id))
+        
+        state = await get_redis().hmget(_key(request_id), 'status', 'response')
+        if state[0] is not None and state[0] != b'pending' and state[1] is not None:
+            return orjson.loads(state[1])
+        
+        async for message in pubsub.listen():
+            if message['type'] != 'message':
+                continue
+            payload = orjson.loads(message['data'])
+            if payload.get('request_id') == str(request_id):
+                return payload.get('response')
+    except Exception as e:
+        logger.warning(f"Stopped listening for HITL response {request_id}: {e}")
+    finally:
+        try:
+            await pubsub.aclose()
+        except Exception:
+            pass
+    return None
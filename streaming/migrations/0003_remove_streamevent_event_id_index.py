@@ -0,0 +1,15 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('streaming', '0002_streamevent_replay_covering'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='streamevent',
+            name='streaming_s_event_i_419511_idx',
+        ),
+    ]
@@ -71,9 +71,14 @@ class StreamEvent(models.Model):
         verbose_name = 'Stream Event'
         verbose_name_plural = 'Stream Events'
         ordering = ['execution', 'sequence']
+        # event_id needs no extra index: unique=True already creates one
         indexes = [
-            models.Index(fields=['event_id']),
-            models.Index(fields=['execution', 'sequence']),
+            # Covers history replay so it can be served by an index-only scan
+            models.Index(
+                fields=['execution', 'sequence'],
+                include=['event_id', 'event_type', 'node_id', 'created_at'],
+                name='streamevent_replay_covering',
+            ),
             models.Index(fields=['execution', 'event_type']),
             models.Index(fields=['user', '-created_at']),
         ]
@@ -0,0 +1,24 @@
+"""
+Streaming Renderers
+"""
+from rest_framework.renderers import BaseRenderer
+
+from .utils import dumps
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    JSON renderer backed by orjson.
+    
+    Encodes UUIDs and datetimes natively, the same way streamed events are
+    encoded, and skips the stdlib encoder on large event payloads.
+    """
+    
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        if data is None:
+            return b''
+        return dumps(data)
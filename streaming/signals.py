@@ -0,0 +1,21 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from core.models import UserProfile
+from logs.models import ExecutionLog
+
+
+@receiver(post_save, sender=ExecutionLog)
+@receiver(post_delete, sender=ExecutionLog)
+def invalidate_execution_owner(sender, instance, **kwargs):
+    """Drop the cached owner so WebSocket access checks re-read it."""
+    from .consumers import invalidate_execution_access
+
+    invalidate_execution_access(instance.execution_id)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_stream_tier(sender, instance, **kwargs):
+    """Drop the tier cached by StreamConnectionStatusView so upgrades apply at once."""
+    cache.delete(f'stream_tier_{instance.user_id}')
@@ -1,10 +1,29 @@
+import asyncio
+import csv
+import uuid
+from datetime import timedelta
+from unittest import skipUnless
+from unittest.mock import AsyncMock, Mock, patch
+
+import redis
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth.models import User
 from .models import StreamEvent
 from logs.models import ExecutionLog
 
+
+def _redis_available() -> bool:
+    try:
+        return redis.from_url(settings.REDIS_URL, socket_connect_timeout=0.5).ping()
+    except redis.RedisError:
+        return False
+
+
 class StreamingSerializationTests(APITestCase):
     """
     Tests for Streaming serializers and views validation.
@@ -53,3 +72,266 @@ class StreamingSerializationTests(APITestCase):
         response = self.client.get(url, {'limit': 10, 'after_sequence': 0})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['events']), 1)
+        self.assertEqual(
+            response.json()['events'][0]['timestamp'],
+            StreamEvent.objects.get(execution=self.execution).created_at.isoformat(),
+        )
+
+    def test_status_reflects_tier_change(self):
+        """A saved profile tier shows up at once despite the cached tier."""
+        from core.models import UserProfile
+        url = reverse('streaming:connection-status')
+        profile = UserProfile.objects.create(user=self.user)
+        
+        response = self.client.get(url)
+        self.assertEqual(response.data['tier'], 'free')
+        self.assertEqual(response.data['max_connections'], 5)
+        
+        profile.tier = 'pro'
+        profile.save()
+        
+        response = self.client.get(url)
+        self.assertEqual(response.data['tier'], 'pro')
+        self.assertEqual(response.data['max_connections'], 20)
+
+    def test_pending_hitl_wire_format(self):
+        """Pending HITL requests keep str(uuid) and isoformat() timestamps on the socket."""
+        from asgiref.sync import async_to_sync
+        from orchestrator.models import HITLRequest
+        from .consumers import HITLNotificationConsumer
+        from .utils import dumps
+        
+        hitl = HITLRequest.objects.create(
+            execution=self.execution, user=self.user, request_type='approval',
+            title='Approve?', message='Send it?', options=['approve', 'reject'],
+        )
+        consumer = HITLNotificationConsumer()
+        consumer.user_id = self.user.id
+        
+        pending = async_to_sync(consumer._get_pending_requests)()
+        
+        self.assertEqual(pending[0]['request_id'], str(hitl.request_id))
+        self.assertEqual(pending[0]['created_at'], hitl.created_at.isoformat())
+        self.assertIn(f'"created_at":"{hitl.created_at.isoformat()}"', dumps(pending).decode())
+
+
+class StreamEventWriterTests(TestCase):
+    """
+    Tests for the batched stream event writer.
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(username='eventwriter', password='password123')
+        
+        from orchestrator.models import Workflow
+        self.workflow = Workflow.objects.create(
+            user=self.user,
+            name="Writer Workflow",
+            nodes=[],
+            edges=[]
+        )
+        self.execution = ExecutionLog.objects.create(
+            user=self.user,
+            workflow=self.workflow,
+            status="running"
+        )
+
+    def test_copy_rows_keep_empty_node_id(self):
+        """Execution-level events (no node_id) must not become NULL in COPY."""
+        from .event_writer import _COPY_SQL, StreamEventWriter
+        
+        event_id = uuid.uuid4()
+        created_at = timezone.now()
+        rows = [(event_id, 7, 3, 'workflow_start', '', {'a': 1}, 1, created_at)]
+        
+        self.assertIn('FORCE_NOT_NULL (node_id)', _COPY_SQL)
+        parsed = list(csv.reader(StreamEventWriter._copy_buffer(rows)))
+        self.assertEqual(parsed, [[
+            str(event_id), '7', '3', 'workflow_start', '', '{"a":1}', '1', created_at.isoformat(),
+        ]])
+
+    def test_bulk_create_fallback_persists_batch(self):
+        """The non-PostgreSQL path stores every row with its recorded timestamp."""
+        from .broadcaster import StreamEvent as BroadcastEvent
+        from .event_writer import StreamEventWriter
+        
+        recorded_at = timezone.now() - timedelta(minutes=5)
+        execution_id = str(self.execution.execution_id)
+        StreamEventWriter()._write_batch([
+            (execution_id, BroadcastEvent('workflow_start', {}), recorded_at),
+            (execution_id, BroadcastEvent('node_start', {'node_id': 'n1'}), recorded_at),
+        ])
+        
+        events = list(StreamEvent.objects.filter(execution=self.execution).order_by('sequence'))
+        self.assertEqual([e.sequence for e in events], [1, 2])
+        self.assertEqual([e.node_id for e in events], ['', 'n1'])
+        self.assertTrue(all(e.created_at == recorded_at for e in events))
+
+    def test_writers_in_separate_processes_share_one_sequence(self):
+        """The ASGI process and a Celery worker never reuse a sequence number."""
+        from .broadcaster import StreamEvent as BroadcastEvent
+        from .event_writer import StreamEventWriter
+        
+        execution_id = str(self.execution.execution_id)
+        asgi, worker = StreamEventWriter(), StreamEventWriter()
+        for writer in (worker, asgi, worker, asgi):
+            writer._write_batch([(execution_id, BroadcastEvent('progress', {}), timezone.now())])
+        
+        sequences = list(
+            StreamEvent.objects.filter(execution=self.execution).values_list('sequence', flat=True)
+        )
+        self.assertEqual(sequences, [1, 2, 3, 4])
+
+
+class _FakePubSub:
+    """Minimal redis.asyncio PubSub double; SUBSCRIBE fails while ``down``."""
+    def __init__(self, redis):
+        self._redis = redis
+    
+    async def subscribe(self, *channels):
+        if self._redis.down:
+            raise ConnectionError("redis unavailable")
+        self._redis.subscribed.update(channels)
+    
+    async def unsubscribe(self, *channels):
+        self._redis.subscribed.difference_update(channels)
+    
+    async def listen(self):
+        await asyncio.Event().wait()
+        yield
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.down = False
+        self.subscribed = set()
+        self.published = []
+    
+    def pubsub(self):
+        return _FakePubSub(self)
+    
+    async def publish(self, channel, data):
+        self.published.append(channel)
+
+
+class ExecutionEventHubTests(SimpleTestCase):
+    """
+    Tests for Redis subscription recovery in the execution event hub.
+    """
+    async def test_failed_subscribe_is_retried_after_backoff(self):
+        """A SUBSCRIBE lost to a Redis outage is re-issued once Redis is back."""
+        from .broadcaster import ExecutionEventHub, StreamEvent as BroadcastEvent
+        
+        redis = _FakeRedis()
+        hub = ExecutionEventHub()
+        channel = hub.channel('exec-1')
+        
+        with patch('streaming.broadcaster.get_redis', return_value=redis), \
+                patch('streaming.broadcaster.get_event_writer'):
+            redis.down = True
+            await hub.subscribe('exec-1', asyncio.Queue())
+            self.assertNotIn(channel, redis.subscribed)
+            
+            # Backoff expires and Redis recovers
+            redis.down = False
+            hub._redis_retry_at = 0.0
+            await hub.publish('exec-1', BroadcastEvent('progress', {}))
+            
+            self.assertIn(channel, redis.subscribed)
+            self.assertEqual(redis.published, [channel])
+            self.assertFalse(hub._unsubscribed)
+            
+            hub._reader.cancel()
+
+
+
+class RedisClientLifecycleTests(SimpleTestCase):
+    """
+    Tests for per-loop Redis clients under Celery's asyncio.run() loops.
+    """
+    def test_run_async_closes_loop_client(self):
+        """The client a task's loop opened is closed and forgotten when it ends."""
+        from .utils import _redis_clients, get_redis, run_async
+        
+        client = Mock(aclose=AsyncMock())
+        
+        async def task():
+            return get_redis()
+        
+        with patch('streaming.utils.aioredis.from_url', return_value=client):
+            self.assertIs(run_async(task()), client)
+            self.assertIs(run_async(task()), client)
+        
+        self.assertEqual(client.aclose.await_count, 2)
+        self.assertNotIn(client, list(_redis_clients.values()))
+
+@skipUnless(_redis_available(), "Redis is not reachable")
+class HITLStateTests(SimpleTestCase):
+    """
+    Tests for the Redis compare-and-set on HITL answers.
+    """
+    def setUp(self):
+        self.request_id = uuid.uuid4()
+        self.addCleanup(redis.from_url(settings.REDIS_URL).delete, f"hitl:{self.request_id}")
+
+    async def test_answer_without_state_falls_back(self):
+        """No Redis state: None, so the caller takes the ORM path."""
+        from . import hitl_state
+        
+        self.assertIsNone(await hitl_state.answer(self.request_id, 1, 'approved', 'approve'))
+
+    async def test_only_first_answer_from_owner_wins(self):
+        """The owner's first answer is recorded; others and repeats are refused."""
+        from . import hitl_state
+        
+        await hitl_state.mark_pending(self.request_id, 1, 60)
+        
+        self.assertFalse(await hitl_state.answer(self.request_id, 2, 'approved', 'approve'))
+        self.assertTrue(await hitl_state.answer(self.request_id, 1, 'rejected', {'value': 'no'}))
+        self.assertFalse(await hitl_state.answer(self.request_id, 1, 'approved', 'approve'))
+        
+        state = await hitl_state.get_redis().hgetall(f"hitl:{self.request_id}")
+        self.assertEqual(state[b'status'], b'rejected')
+        self.assertEqual(state[b'response'], b'{"value":"no"}')
+
+    async def test_cleared_state_is_not_answerable(self):
+        """Once the row settles elsewhere the key is gone and answers fall back."""
+        from . import hitl_state
+        
+        await hitl_state.mark_pending(self.request_id, 1, 60)
+        await hitl_state.clear(self.request_id)
+        
+        self.assertIsNone(await hitl_state.answer(self.request_id, 1, 'approved', 'approve'))
+
+    async def test_script_reloaded_after_flush(self):
+        """EVALSHA misses after SCRIPT FLUSH are retried with EVAL."""
+        from . import hitl_state
+        
+        await hitl_state.mark_pending(self.request_id, 1, 60)
+        await hitl_state.get_redis().script_flush()
+        
+        self.assertTrue(await hitl_state.answer(self.request_id, 1, 'approved', 'approve'))
+
+
+class ExecutionConsumerQueueTests(SimpleTestCase):
+    """
+    Tests for the bounded WebSocket outbound queue.
+    """
+    async def test_slow_client_drops_events_instead_of_growing(self):
+        """Once the queue is full, channel-layer and hub events are dropped and logged."""
+        from workflow_backend.thresholds import WS_OUTBOUND_QUEUE_SIZE
+        from .broadcaster import ExecutionEventHub, StreamEvent as BroadcastEvent
+        from .consumers import ExecutionConsumer
+        
+        consumer = ExecutionConsumer()
+        for i in range(WS_OUTBOUND_QUEUE_SIZE):
+            await consumer.notification({'data': {'n': i}})
+        
+        with self.assertLogs('streaming.consumers', 'WARNING'):
+            await consumer.hitl_request({'request': {}})
+        self.assertEqual(consumer._outbound.qsize(), WS_OUTBOUND_QUEUE_SIZE)
+        
+        hub = ExecutionEventHub()
+        hub._queues['exec-1'] = {consumer._outbound}
+        with self.assertLogs('streaming.broadcaster', 'WARNING'):
+            hub._dispatch('exec-1', BroadcastEvent('progress', {}))
+        self.assertEqual(consumer._outbound.qsize(), WS_OUTBOUND_QUEUE_SIZE)
@@ -0,0 +1,101 @@
+"""
+Streaming Utilities
+"""
+import asyncio
+import weakref
+from datetime import date, datetime
+from typing import Any
+from uuid import UUID
+
+import msgpack
+import orjson
+import redis.asyncio as aioredis
+from channels.layers import get_channel_layer
+from django.conf import settings
+
+# datetime/UUID are encoded natively; naive datetimes are treated as UTC.
+# Non-str keys are allowed because node outputs may carry int-keyed dicts.
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+_channel_layer = None
+
+_redis_clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aioredis.Redis]' = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def dumps(data: Any) -> bytes:
+    """Serialize a payload to JSON bytes."""
+    return orjson.dumps(data, option=ORJSON_OPTIONS)
+
+
+def _msgpack_default(obj: Any) -> Any:
+    # Mirror the JSON encoding so both wire formats carry the same values
+    if isinstance(obj, datetime):
+        return dumps(obj)[1:-1].decode()
+    if isinstance(obj, (date, UUID)):
+        return str(obj)
+    raise TypeError(f"Cannot serialize {type(obj).__name__} to msgpack")
+
+
+def packb(data: Any) -> bytes:
+    """Serialize a payload to msgpack bytes."""
+    return msgpack.packb(data, default=_msgpack_default)
+
+
+def unpackb(data: bytes) -> Any:
+    """Deserialize a msgpack payload."""
+    return msgpack.unpackb(data, strict_map_key=False)
+
+
+def get_redis() -> aioredis.Redis:
+    """
+    Get the async Redis client for the running event loop.
+    
+    redis.asyncio connections are bound to the loop that opened them, and
+    Celery tasks drive async code through a fresh asyncio.run() loop per
+    call, so one client is kept per loop. Such short-lived loops must close
+    their client before they end (see run_async), or its pooled connections
+    keep the loop, and their sockets, alive.
+    """
+    loop = asyncio.get_running_loop()
+    client = _redis_clients.get(loop)
+    if client is None:
+        client = _redis_clients[loop] = aioredis.from_url(settings.REDIS_URL)
+    return client
+
+
+async def close_redis() -> None:
+    """Close the running loop's Redis client, if it opened one."""
+    client = _redis_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def run_async(coro) -> Any:
+    """
+    asyncio.run() for Celery tasks.
+    
+    Closes the Redis client opened on the task's loop before the loop is
+    torn down, so long-lived workers do not accumulate one per task.
+    """
+    async def main():
+        try:
+            return await coro
+        finally:
+            await close_redis()
+    
+    return asyncio.run(main())
+
+
+def get_shared_channel_layer():
+    """
+    Get the default channel layer, resolved once per process.
+    
+    Skips the settings/registry lookup of get_channel_layer() on hot
+    notification paths.
+    """
+    global _channel_layer
+    if _channel_layer is None:
+        _channel_layer = get_channel_layer()
+    return _channel_layer
@@ -20,7 +20,9 @@ from rest_framework.permissions import IsAuthenticated
 from logs.models import ExecutionLog
 from .broadcaster import get_broadcaster, StreamEvent
 from .models import StreamEvent as StreamEventModel
+from .renderers import ORJSONRenderer
 from core.throttling import StreamThrottle
+from workflow_backend.thresholds import STREAM_TIER_CACHE_TTL_SECONDS
 
 logger = logging.getLogger(__name__)
 
@@ -77,11 +79,11 @@ class ExecutionStreamView(APIView):
                     
                     event_type = 'workflow_complete' if current_exec.status == 'completed' else 'workflow_error'
                     
-                    # Yield formatted SSE
+                    # Yield encoded SSE
                     yield StreamEvent(
                         event_type=event_type,
                         data=data
-                    ).format_sse()
+                    ).encode_sse()
                     return
             except Exception as e:
                 logger.error(f"Failed to check initial status for {execution_id}: {e}")
@@ -124,6 +126,8 @@ class ExecutionEventsHistoryView(APIView):
     """
     
     permission_classes = [IsAuthenticated]
+    # orjson encodes the UUIDs and datetimes natively
+    renderer_classes = [ORJSONRenderer]
     
     def get(self, request, execution_id: UUID):
         """Get execution event history."""
@@ -146,26 +150,31 @@ class ExecutionEventsHistoryView(APIView):
         after_sequence = serializer.validated_data['after_sequence']
         limit = serializer.validated_data['limit']
         
-        # Get events from database
-        events = StreamEventModel.objects.filter(
-            execution__execution_id=execution_id,
-            sequence__gt=after_sequence
-        ).order_by('sequence')[:limit]
+        # Fetch only the replay columns; no model instances are built
+        rows = list(
+            StreamEventModel.objects.filter(
+                execution__execution_id=execution_id,
+                sequence__gt=after_sequence
+            ).order_by('sequence').values_list(
+                'event_id', 'event_type', 'data', 'node_id', 'sequence', 'created_at'
+            )[:limit]
+        )
         
         return Response({
-            'execution_id': str(execution_id),
+            'execution_id': execution_id,
             'events': [
                 {
-                    'id': str(e.event_id),
-                    'type': e.event_type,
-                    'data': e.data,
-                    'node_id': e.node_id,
-                    'sequence': e.sequence,
-                    'timestamp': e.created_at.isoformat(),
+                    'id': event_id,
+                    'type': event_type,
+                    'data': data,
+                    'node_id': node_id,
+                    'sequence': sequence,
+                    # isoformat() keeps the +00:00 offset clients already parse
+                    'timestamp': created_at.isoformat(),
                 }
-                for e in events
+                for event_id, event_type, data, node_id, sequence, created_at in rows
             ],
-            'has_more': events.count() == limit
+            'has_more': len(rows) == limit
         })
 
 
@@ -183,26 +192,26 @@ class StreamConnectionStatusView(APIView):
     def get(self, request):
         """Get connection status."""
         from django.core.cache import cache
+        from core.models import UserProfile
         
         user = request.user
-        cache_key = f'stream_connections_{user.pk}'
-        current_connections = cache.get(cache_key, 0)
+        connections_key = f'stream_connections_{user.pk}'
+        tier_key = f'stream_tier_{user.pk}'
         
-        # Get limit from profile
-        try:
-            tier = user.profile.tier
-        except AttributeError:
-            tier = 'free'
+        # Connection count and tier in one cache round-trip
+        cached = cache.get_many([connections_key, tier_key])
+        current_connections = cached.get(connections_key, 0)
         
-        limits = {
-            'free': 5,
-            'pro': 20,
-            'enterprise': 100,
-        }
+        tier = cached.get(tier_key)
+        if tier is None:
+            tier = UserProfile.objects.filter(
+                user_id=user.pk
+            ).values_list('tier', flat=True).first() or 'free'
+            cache.set(tier_key, tier, STREAM_TIER_CACHE_TTL_SECONDS)
         
         return Response({
             'current_connections': current_connections,
-            'max_connections': limits.get(tier, 5),
+            'max_connections': StreamThrottle.connection_limits.get(tier, 5),
             'tier': tier,
         })
 
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('templates', '0002_alter_workflowtemplate_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='workflowtemplate',
+            index=models.Index(fields=['status', '-usage_count'], name='tmpl_status_usage_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workflowtemplate',
+            index=models.Index(
+                condition=models.Q(('embedding__isnull', False)),
+                fields=['status'],
+                name='tmpl_status_hasemb_idx',
+            ),
+        ),
+    ]
@@ -90,6 +90,16 @@ class WorkflowTemplate(models.Model):
     
     class Meta:
         ordering = ['-is_featured', '-usage_count', '-average_rating']
+        indexes = [
+            # Gallery listing: status filter + default usage ordering
+            models.Index(fields=['status', '-usage_count'], name='tmpl_status_usage_idx'),
+            # Search matrix build: production templates that have an embedding
+            models.Index(
+                fields=['status'],
+                condition=models.Q(embedding__isnull=False),
+                name='tmpl_status_hasemb_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.status})"
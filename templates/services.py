@@ -1,16 +1,236 @@
 import logging
 import asyncio
+import heapq
+import re
+import threading
+import time
+from collections import Counter
 import numpy as np
 from typing import List, Dict, Any, Optional
 from django.db.models import Avg, Count, Q, F
 from django.db import transaction, models
 from django.conf import settings
 
+from workflow_backend.thresholds import (
+    TEMPLATE_EMBEDDING_INDEX_TTL_SECONDS,
+    TEMPLATE_VECTOR_INDEX,
+    TEMPLATE_VECTOR_RESCORE_FACTOR,
+)
 from .models import WorkflowTemplate, WorkflowRating
 from inference.engine import get_platform_knowledge_base
 
 logger = logging.getLogger(__name__)
 
+# Config keys whose values are blanked when a workflow is published as a template
+_SECRET_RE = re.compile(r'api_key|token|secret|password|key', re.IGNORECASE)
+
+
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+
+def _cosine_scores(matrix: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity of each row of ``matrix`` with the unit query ``q``.
+
+    Rows are stored unit-length, so this is a plain inner product.
+    """
+    if simsimd is not None:
+        # Direct AVX-512/NEON dot kernel
+        return np.asarray(simsimd.cdist(matrix, q.reshape(1, -1), metric='dot')).reshape(-1)
+    return matrix @ q
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first, in O(N + k log k)."""
+    if k >= len(scores):
+        return np.argsort(scores)[::-1]
+    top = np.argpartition(scores, -k)[-k:]
+    return top[np.argsort(scores[top])[::-1]]
+
+
+class EmbeddingSnapshot:
+    """
+    One generation of the template embedding matrix, never mutated.
+
+    Readers capture a snapshot once per call and use only its arrays, so a
+    concurrent rebuild cannot pair one generation's rows with another's scores.
+    """
+
+    def __init__(self, ids: np.ndarray, matrix: np.ndarray, faiss_index=None, faiss_binary: bool = False):
+        self.ids = ids
+        self.rows: Dict[int, int] = {int(pk): i for i, pk in enumerate(ids)}  # template id -> matrix row
+        self.matrix = matrix
+        self.matrix.flags.writeable = False
+        self.faiss = faiss_index  # inner-product index over `matrix` (cosine, rows are unit length)
+        self.faiss_binary = faiss_binary
+
+    def scores(self, query_emb) -> Optional[np.ndarray]:
+        """Cosine score of every row against the query, or None on a dimension mismatch."""
+        q = np.asarray(query_emb, dtype=np.float32)
+        if not len(self.ids) or q.shape[0] != self.matrix.shape[1]:
+            return None
+        q_norm = np.linalg.norm(q)
+        if q_norm == 0:
+            return np.zeros(len(self.ids), dtype=np.float32)
+        return _cosine_scores(self.matrix, q / q_norm)
+
+    def nearest(self, query_emb, k: int, exclude: Optional[int] = None) -> List[tuple]:
+        """Top-k (template id, cosine score) pairs, best first."""
+        q = np.asarray(query_emb, dtype=np.float32)
+        if not len(self.ids) or q.shape[0] != self.matrix.shape[1]:
+            return []
+        q_norm = np.linalg.norm(q)
+        if q_norm == 0:
+            return []
+        q = (q / q_norm).reshape(1, -1)
+        k = min(k + (exclude is not None), len(self.ids))
+
+        if self.faiss is not None and TEMPLATE_VECTOR_INDEX != 'flat':
+            # Approximate shortlist, then exact cosine on the float32 rows
+            shortlist = min(k * TEMPLATE_VECTOR_RESCORE_FACTOR, len(self.ids))
+            if self.faiss_binary:
+                _, rows = self.faiss.search(np.packbits(q > 0, axis=1), shortlist)
+            else:
+                _, rows = self.faiss.search(q, shortlist)
+            rows = rows[0][rows[0] >= 0]
+            exact = _cosine_scores(self.matrix[rows], q[0])
+            order = _top_k(exact, k)
+            rows, scores = rows[order], exact[order]
+        elif self.faiss is not None:
+            scores, rows = self.faiss.search(q, k)
+            scores, rows = scores[0], rows[0]
+        else:
+            all_scores = _cosine_scores(self.matrix, q[0])
+            rows = _top_k(all_scores, k)
+            scores = all_scores[rows]
+
+        return [
+            (int(self.ids[row]), float(score))
+            for row, score in zip(rows, scores)
+            if row >= 0 and int(self.ids[row]) != exclude
+        ][:k - (exclude is not None)]
+
+
+_EMPTY_SNAPSHOT = EmbeddingSnapshot(np.empty(0, dtype=np.int64), np.empty((0, 0), dtype=np.float32))
+
+
+class TemplateEmbeddingIndex:
+    """
+    Process-local, L2-normalized embedding matrix of production templates.
+
+    Built with one two-column query and reused across searches until a
+    WorkflowTemplate is saved/deleted in this process (see signals.py) or
+    the TTL expires, which bounds staleness from other processes' edits.
+    Each build is a new EmbeddingSnapshot published by a single assignment.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = 0
+        self._built_version = -1
+        self._built_at = 0.0
+        self._snapshot = _EMPTY_SNAPSHOT
+
+    def invalidate(self):
+        """Mark the matrix stale; it is rebuilt on next use."""
+        with self._lock:
+            self._version += 1
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._built_version == self._version
+            and time.monotonic() - self._built_at < TEMPLATE_EMBEDDING_INDEX_TTL_SECONDS
+        )
+
+    def refresh(self) -> EmbeddingSnapshot:
+        """Rebuild the matrix if stale (sync, runs ORM queries) and return the current snapshot."""
+        if self._is_fresh():
+            return self._snapshot
+
+        with self._lock:
+            if self._is_fresh():
+                return self._snapshot
+            version = self._version
+
+            rows = list(
+                WorkflowTemplate.objects.filter(status='production')
+                .exclude(embedding=None)
+                .values_list('id', 'embedding')
+            )
+            # Keep the dominant dimension; blobs from another model are skipped
+            sizes = Counter(len(blob) for _, blob in rows if blob)
+            size = sizes.most_common(1)[0][0] if sizes else 0
+            rows = [(pk, blob) for pk, blob in rows if blob and len(blob) == size]
+
+            if rows:
+                # One contiguous (N, D) block filled row by row straight from each blob,
+                # with no intermediate joined buffer or per-row arrays kept around
+                matrix = np.empty((len(rows), size // 4), dtype=np.float32)
+                for i, (_, blob) in enumerate(rows):
+                    matrix[i] = np.frombuffer(blob, dtype=np.float32)
+                # New embeddings are stored unit-length; this covers rows written before that
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                np.divide(matrix, norms, out=matrix, where=norms != 0)
+                ids = np.fromiter((pk for pk, _ in rows), dtype=np.int64, count=len(rows))
+                self._snapshot = EmbeddingSnapshot(ids, matrix, *self._build_faiss(matrix))
+            else:
+                self._snapshot = _EMPTY_SNAPSHOT
+            self._built_version = version
+            self._built_at = time.monotonic()
+            return self._snapshot
+
+    @staticmethod
+    def _build_faiss(matrix: np.ndarray) -> tuple:
+        """FAISS index for `matrix` and whether it is a binary (Hamming) index."""
+        try:
+            import faiss
+        except ImportError:
+            return None, False
+        if TEMPLATE_VECTOR_INDEX == 'binary' and matrix.shape[1] % 8 == 0:
+            # Sign bits packed 8 per byte (32x smaller); searched by Hamming distance
+            index = faiss.IndexBinaryFlat(matrix.shape[1])
+            index.add(np.packbits(matrix > 0, axis=1))
+            return index, True
+        if TEMPLATE_VECTOR_INDEX == 'sq8':
+            # 8-bit scalar quantization: 4x smaller than float32, trained on the current rows
+            index = faiss.IndexScalarQuantizer(
+                matrix.shape[1], faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT
+            )
+            index.train(matrix)
+        else:
+            index = faiss.IndexFlatIP(matrix.shape[1])
+        index.add(matrix)
+        return index, False
+
+    async def arefresh(self) -> EmbeddingSnapshot:
+        from asgiref.sync import sync_to_async
+        if self._is_fresh():
+            return self._snapshot
+        return await sync_to_async(self.refresh)()
+
+    def scores(self, query_emb) -> Optional[np.ndarray]:
+        """Cosine score of every row against the current snapshot."""
+        return self._snapshot.scores(query_emb)
+
+    def nearest(self, query_emb, k: int, exclude: Optional[int] = None) -> List[tuple]:
+        """Top-k (template id, cosine score) pairs from the current snapshot, best first."""
+        return self._snapshot.nearest(query_emb, k, exclude)
+
+
+_embedding_index: TemplateEmbeddingIndex | None = None
+
+
+def get_template_embedding_index() -> TemplateEmbeddingIndex:
+    """Get the process-wide template embedding index."""
+    global _embedding_index
+    if _embedding_index is None:
+        _embedding_index = TemplateEmbeddingIndex()
+    return _embedding_index
+
+
 class TemplateService:
     async def publish_workflow_as_template(self, workflow_id: int) -> WorkflowTemplate | None:
         """
@@ -51,11 +271,17 @@ class TemplateService:
                 template = WorkflowTemplate(source_workflow_id=wf.id, **defaults)
                 await template.asave()
             
-            # Embed for search
+            # Embed for search on a worker; inline only if the broker is unreachable
+            from .tasks import compute_template_embedding
             try:
-                await self.update_embedding(template)
+                # delay() is a blocking broker round-trip; keep it off the event loop
+                await sync_to_async(compute_template_embedding.delay, thread_sensitive=False)(template.id)
             except Exception as e:
-                logger.error(f"Failed to update embedding: {e}")
+                logger.warning(f"Could not queue embedding for template {template.id}, embedding inline: {e}")
+                try:
+                    await self.update_embedding(template)
+                except Exception as e:
+                    logger.error(f"Failed to update embedding: {e}")
             
             return template
             
@@ -94,12 +320,74 @@ class TemplateService:
         """Update the vector embedding for semantic search."""
         kb = get_platform_knowledge_base()
         
-        text = f"{template.name}\n{template.description}\n{template.category}\n" + " ".join(template.tags)
-        embedding = await kb.embed_text(text)
+        embedding = await kb.embed_text(self._embedding_text(template))
         
         if embedding is not None:
-             template.embedding = embedding.tobytes()
-             await template.asave()
+             template.embedding = self._unit_vector_bytes(embedding)
+             # Only the embedding, so a late task can't overwrite newer template fields
+             await template.asave(update_fields=['embedding', 'updated_at'])
+
+    async def bulk_update_embeddings(self, templates: List[WorkflowTemplate]) -> int:
+        """
+        Re-embed many templates and write them back in batched UPDATEs.
+        
+        Returns:
+            Number of templates whose embedding was updated.
+        """
+        from asgiref.sync import sync_to_async
+        
+        if not templates:
+            return 0
+        
+        kb = get_platform_knowledge_base()
+        embeddings = await kb.embed_texts([self._embedding_text(t) for t in templates])
+        if embeddings is None:
+            return 0
+        
+        updated = []
+        for template, embedding in zip(templates, embeddings):
+            template.embedding = self._unit_vector_bytes(embedding)
+            updated.append(template)
+        
+        if updated:
+            await sync_to_async(WorkflowTemplate.objects.bulk_update)(
+                updated, ['embedding'], batch_size=500
+            )
+            # bulk_update sends no post_save
+            get_template_embedding_index().invalidate()
+        return len(updated)
+
+    @staticmethod
+    def _unit_vector_bytes(embedding) -> bytes:
+        """Stored embeddings are L2-normalized float32, so cosine is a plain dot product."""
+        embedding = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(embedding)
+        if norm:
+            embedding = embedding / norm
+        return embedding.astype(np.float32, copy=False).tobytes()
+
+    @staticmethod
+    def _embedding_text(template: WorkflowTemplate) -> str:
+        return f"{template.name}\n{template.description}\n{template.category}\n" + " ".join(template.tags)
+
+    async def similar_templates(self, template: WorkflowTemplate, limit: int = 5) -> List[WorkflowTemplate]:
+        """
+        Nearest production templates by embedding, most similar first.
+        Falls back to a hybrid search on the name for templates without an embedding.
+        """
+        index = await get_template_embedding_index().arefresh()
+        row = index.rows.get(template.id)
+        if row is None:
+            results = await self.hybrid_search(query=template.name, page_size=limit + 1)
+            return [item for item in results['items'] if item.id != template.id][:limit]
+
+        neighbours = await asyncio.to_thread(index.nearest, index.matrix[row], limit, template.id)
+        found = await WorkflowTemplate.objects.filter(status='production').defer(
+            'embedding', 'nodes', 'edges', 'workflow_settings'
+        ).ain_bulk(
+            [pk for pk, _ in neighbours]
+        )
+        return [found[pk] for pk, _ in neighbours if pk in found]
 
     async def hybrid_search(
         self, 
@@ -121,12 +409,15 @@ class TemplateService:
         if min_rating:
             queryset = queryset.filter(average_rating__gte=min_rating)
             
-        # Materialize queryset into a list of objects we need for scoring
-        # This is a DB hit, so we use sync_to_async if needed, or simply iterate.
-        # Since we need embeddings, let's fetch them now.
-        templates = []
-        async for tmpl in queryset:
-            templates.append(tmpl)
+        # Only the columns used for scoring/sorting; embeddings come from the
+        # cached matrix and full rows are loaded for the requested page only
+        templates = [
+            tmpl async for tmpl in queryset.values_list(
+                'id', 'name', 'description', 'tags', 'is_featured',
+                'average_rating', 'usage_count', 'rating_count', 'created_at',
+                named=True,
+            )
+        ]
 
         if not templates:
             return {'items': [], 'scores': {}, 'total': 0, 'page': page, 'pages': 0}
@@ -134,9 +425,11 @@ class TemplateService:
         # 2. Get Vector search results if query is provided
         vector_results = {}
         query_emb = None
+        index = None
         if query:
             kb = get_platform_knowledge_base()
             query_emb = await kb.embed_text(query)
+            index = await get_template_embedding_index().arefresh()
 
         # 3. Offload compute-heavy scoring to a separate thread
         def compute_scores(items, q_text, q_emb):
@@ -144,18 +437,16 @@ class TemplateService:
             v_results = {}
             f_results = {}
             q_lower = q_text.lower() if q_text else ""
-            
+
+            # Vector Scores: a single (N, D) @ (D,) product over the cached matrix
+            scores = index.scores(q_emb) if index is not None and q_emb is not None else None
+            if scores is not None:
+                for tmpl in items:
+                    row = index.rows.get(tmpl.id)
+                    if row is not None:
+                        v_results[tmpl.id] = float(scores[row])
+
             for tmpl in items:
-                # Vector Score
-                if q_emb is not None and tmpl.embedding:
-                    try:
-                        tmpl_emb = np.frombuffer(tmpl.embedding, dtype='float32')
-                        norm_product = np.linalg.norm(tmpl_emb) * np.linalg.norm(q_emb)
-                        score = 0 if norm_product == 0 else float(np.dot(tmpl_emb, q_emb) / norm_product)
-                        v_results[tmpl.id] = score
-                    except Exception:
-                        v_results[tmpl.id] = 0
-                
                 # Fuzzy Score
                 if q_lower:
                     text_to_match = f"{tmpl.name} {tmpl.description} {' '.join(tmpl.tags)}".lower()
@@ -191,22 +482,25 @@ class TemplateService:
 
         # 5. Sorting
         if sort == 'rating':
-            scored_items.sort(key=lambda x: (x['instance'].average_rating, x['score']), reverse=True)
+            sort_key = lambda x: (x['instance'].average_rating, x['score'])
         elif sort == 'trending':
-            scored_items.sort(key=lambda x: (x['instance'].usage_count * 2 + x['instance'].rating_count), reverse=True)
+            sort_key = lambda x: (x['instance'].usage_count * 2 + x['instance'].rating_count)
         elif sort == 'newest':
-            scored_items.sort(key=lambda x: x['instance'].created_at, reverse=True)
+            sort_key = lambda x: x['instance'].created_at
         else: # relevance
-            scored_items.sort(key=lambda x: x['score'], reverse=True)
+            sort_key = lambda x: x['score']
 
-        # 6. Pagination
+        # 6. Pagination: only rank as far as the end of the requested page
         total = len(scored_items)
         start = (page - 1) * page_size
         end = start + page_size
-        paginated_data = scored_items[start:end]
+        paginated_data = heapq.nlargest(end, scored_items, key=sort_key)[start:end]
+        page_rows = await WorkflowTemplate.objects.defer(
+            'embedding', 'nodes', 'edges', 'workflow_settings'
+        ).ain_bulk([item['id'] for item in paginated_data])
         
         return {
-            'items': [item['instance'] for item in paginated_data],
+            'items': [page_rows[item['id']] for item in paginated_data if item['id'] in page_rows],
             'scores': {item['id']: item['score'] for item in paginated_data},
             'total': total,
             'page': page,
@@ -215,28 +509,39 @@ class TemplateService:
 
     def _scrub_credentials(self, nodes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        Deep copy nodes and remove sensitive credential fields.
+        Copy nodes with sensitive credential fields removed.
+
+        Only the node, data and config dicts on a scrubbed path are copied;
+        untouched nodes and nested values are shared with the input.
         """
-        import copy
-        safe_nodes = copy.deepcopy(nodes)
+        safe_nodes = []
         
-        for node in safe_nodes:
+        for node in nodes:
             data = node.get('data', {})
+            config = data.get('config', {})
+            
+            secret_keys = []
+            if isinstance(config, dict):
+                secret_keys = [k for k in config if _SECRET_RE.search(k)]
+                if 'credential' in config:
+                    secret_keys.append('credential')
             
+            if 'credential_id' not in data and not secret_keys:
+                safe_nodes.append(node)
+                continue
+            
+            data = dict(data)
             if 'credential_id' in data:
                 data['credential_id'] = None
-                
-            config = data.get('config', {})
-            if isinstance(config, dict):
-                 keys_to_remove = []
-                 for k in config.keys():
-                     if any(secret in k.lower() for secret in ['api_key', 'token', 'secret', 'password', 'key']):
-                         keys_to_remove.append(k)
-                 
-                 for k in keys_to_remove:
-                     config[k] = ""
-                     
-            if 'credential' in config:
-                config['credential'] = None
+            
+            if secret_keys:
+                config = dict(config)
+                for k in secret_keys:
+                    config[k] = ""
+                if 'credential' in config:
+                    config['credential'] = None
+                data['config'] = config
+            
+            safe_nodes.append({**node, 'data': data})
                 
         return safe_nodes
@@ -1,9 +1,14 @@
-from django.db.models.signals import post_save
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from orchestrator.models import Workflow
-# from .models import WorkflowTemplate # Avoid circular import if needed
+from .models import WorkflowTemplate
 # from .services import TemplateService
 
+logger = logging.getLogger(__name__)
+
 # Signals to auto-publish workflows or sync stats?
 # User requested "The respective workflow should be publically available as template"
 # but defaulting to auto-publish every draft might be too aggressive.
@@ -18,17 +23,35 @@ def sync_workflow_template(sender, instance, created, **kwargs):
     Sync Workflow to Template ONLY if it is deployed (active).
     If it becomes non-active, we should hide/archive the template.
     """
-    from .services import TemplateService
-    from .models import WorkflowTemplate
+    from .services import TemplateService, get_template_embedding_index
+    from .tasks import publish_workflow_template
     from asgiref.sync import async_to_sync
     
-    service = TemplateService()
-    
     if instance.status == 'active':
-        # This will create/update the template (scrubbed)
-        # Calling async from sync signal
-        async_to_sync(service.publish_workflow_as_template)(instance.id)
+        workflow_id = instance.id
+        
+        def queue_publish():
+            # Create/update the template (scrubbed) on a worker
+            try:
+                publish_workflow_template.delay(workflow_id)
+            except Exception as e:
+                logger.warning(f"Could not queue template publish for workflow {workflow_id}, publishing inline: {e}")
+                async_to_sync(TemplateService().publish_workflow_as_template)(workflow_id)
+        
+        # Only once the Workflow save is committed: the worker must see the row,
+        # and the save's transaction shouldn't wait on the broker or inference
+        transaction.on_commit(queue_publish)
     else:
         # If it's no longer active, we should unpublish it from the gallery
         # We can either delete it or set status to 'draft'
-        WorkflowTemplate.objects.filter(source_workflow_id=instance.id).update(status='draft')
+        # .update() sends no post_save, so drop the cached search matrix explicitly
+        if WorkflowTemplate.objects.filter(source_workflow_id=instance.id).update(status='draft'):
+            get_template_embedding_index().invalidate()
+
+
+@receiver(post_save, sender=WorkflowTemplate)
+@receiver(post_delete, sender=WorkflowTemplate)
+def invalidate_template_embeddings(sender, instance, **kwargs):
+    """Any template change may alter the search matrix (status, embedding)."""
+    from .services import get_template_embedding_index
+    get_template_embedding_index().invalidate()
@@ -0,0 +1,73 @@
+"""
+Celery Tasks for Workflow Templates
+
+Moves template publishing and embedding (model inference) off the
+request thread and the Workflow post_save signal.
+"""
+import logging
+
+from asgiref.sync import async_to_sync
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+def compute_template_embedding(self, template_id: int):
+    """
+    Compute and store the search embedding of a template.
+
+    Args:
+        template_id: WorkflowTemplate to embed
+    """
+    from .models import WorkflowTemplate
+    from .services import TemplateService
+
+    try:
+        template = WorkflowTemplate.objects.get(id=template_id)
+    except WorkflowTemplate.DoesNotExist:
+        logger.warning(f"Template {template_id} not found for embedding")
+        return
+
+    try:
+        async_to_sync(TemplateService().update_embedding)(template)
+    except Exception as e:
+        logger.exception(f"Embedding template {template_id} failed: {e}")
+        self.retry(exc=e)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+def publish_workflow_template(self, workflow_id: int):
+    """
+    Create or update the gallery template of an active workflow.
+
+    Args:
+        workflow_id: Workflow to publish
+    """
+    from .services import TemplateService
+
+    async_to_sync(TemplateService().publish_workflow_as_template)(workflow_id)
+
+
+@shared_task
+def reindex_template_embeddings(batch_size: int = 500):
+    """
+    Re-embed every template, batch by batch.
+
+    Args:
+        batch_size: Templates embedded and written per batch
+    """
+    from .models import WorkflowTemplate
+    from .services import TemplateService
+
+    service = TemplateService()
+    queryset = WorkflowTemplate.objects.only('id', 'name', 'description', 'category', 'tags').order_by('id')
+    ids = list(queryset.values_list('id', flat=True))
+
+    total = 0
+    for start in range(0, len(ids), batch_size):
+        batch = list(queryset.filter(id__in=ids[start:start + batch_size]))
+        total += async_to_sync(service.bulk_update_embeddings)(batch)
+
+    logger.info(f"Re-embedded {total} of {len(ids)} templates")
+    return {"templates": len(ids), "embedded": total}
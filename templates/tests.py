@@ -1,8 +1,23 @@
+import copy
+from unittest import skipIf
+from unittest.mock import patch
+
+import numpy as np
 from django.urls import reverse
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth.models import User
-from .models import WorkflowTemplate
+from .models import WorkflowBookmark, WorkflowTemplate
+from .serializers import TemplateListItemSerializer
+from .services import TemplateEmbeddingIndex, TemplateService, _top_k
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
 
 class TemplatesSerializationTests(APITestCase):
     """
@@ -50,3 +65,215 @@ class TemplatesSerializationTests(APITestCase):
         # Valid rating
         response = self.client.post(url, {'stars': 5}, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class TemplateBookmarkFlagTests(APITestCase):
+    """
+    Tests for is_bookmarked on template list and search results.
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(username='bookmarker', password='password123')
+        self.client.force_authenticate(user=self.user)
+        self.templates = [
+            WorkflowTemplate.objects.create(
+                name=f"Template {i}", nodes=[], edges=[], author=self.user, status='production'
+            )
+            for i in range(3)
+        ]
+        WorkflowBookmark.objects.create(user=self.user, template=self.templates[1])
+
+    def _bookmark_queries(self, queries):
+        return [q for q in queries if WorkflowBookmark._meta.db_table in q['sql']]
+
+    def test_list_and_search_flag_bookmarks_with_one_query(self):
+        """Both endpoints return the same fields and look bookmarks up once per page."""
+        for method, url, data in (
+            (self.client.get, reverse('templates:list'), None),
+            (self.client.post, reverse('templates:search'), {'category': None, 'min_rating': 0}),
+        ):
+            with self.subTest(url=url), CaptureQueriesContext(connection) as ctx:
+                response = method(url, data, format='json')
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                items = response.data['results']
+                self.assertEqual(
+                    {item['id']: item['is_bookmarked'] for item in items},
+                    {t.id: t.id == self.templates[1].id for t in self.templates},
+                )
+                self.assertEqual(set(items[0]), set(TemplateListItemSerializer.Meta.fields))
+                self.assertEqual(len(self._bookmark_queries(ctx.captured_queries)), 1)
+
+class TemplateEmbeddingIndexTests(TestCase):
+    """
+    Tests for TemplateEmbeddingIndex.nearest() top-k selection.
+    """
+    DIM = 64
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='indexuser', password='password123')
+        # Well separated clusters, so the true top-k of a query near a centre
+        # is unambiguous and must survive any quantized shortlist
+        rng = np.random.default_rng(7)
+        centres = rng.standard_normal((6, self.DIM)).astype(np.float32)
+        self.vectors = np.repeat(centres, 8, axis=0) + 0.1 * rng.standard_normal((48, self.DIM)).astype(np.float32)
+        self.templates = WorkflowTemplate.objects.bulk_create([
+            WorkflowTemplate(
+                name=f"Template {i}", nodes=[], edges=[], author=self.user,
+                status='production', embedding=vector.tobytes(),
+            )
+            for i, vector in enumerate(self.vectors)
+        ])
+        self.ids = np.array([t.id for t in self.templates])
+        self.query = centres[2] + 0.05 * rng.standard_normal(self.DIM).astype(np.float32)
+
+    def _index(self, kind='flat'):
+        with patch('templates.services.TEMPLATE_VECTOR_INDEX', kind):
+            return TemplateEmbeddingIndex().refresh()
+
+    def _nearest(self, kind, *args, **kwargs):
+        with patch('templates.services.TEMPLATE_VECTOR_INDEX', kind):
+            return TemplateEmbeddingIndex().refresh().nearest(*args, **kwargs)
+
+    def _exact_ids(self, query, k):
+        unit = self.vectors / np.linalg.norm(self.vectors, axis=1, keepdims=True)
+        scores = unit @ (query / np.linalg.norm(query))
+        return [int(pk) for pk in self.ids[np.argsort(scores)[::-1][:k]]]
+
+    def test_nearest_is_exact_top_k(self):
+        """Flat search returns the k best ids, best first."""
+        result = self._nearest('flat', self.query, 5)
+
+        self.assertEqual([pk for pk, _ in result], self._exact_ids(self.query, 5))
+        scores = [score for _, score in result]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_nearest_excludes_query_template(self):
+        """The excluded template is dropped and k results are still returned."""
+        own = self.templates[16]
+        result = self._nearest('flat', self.vectors[16], 5, exclude=own.id)
+
+        ids = [pk for pk, _ in result]
+        self.assertNotIn(own.id, ids)
+        self.assertEqual(ids, self._exact_ids(self.vectors[16], 6)[1:])
+
+    def test_k_larger_than_index_is_clipped(self):
+        """Asking for more than the index holds returns every template once."""
+        result = self._nearest('flat', self.query, 500)
+        self.assertEqual([pk for pk, _ in result], self._exact_ids(self.query, 48))
+
+        result = self._nearest('flat', self.query, 500, exclude=self.templates[0].id)
+        self.assertEqual(len(result), 47)
+        self.assertNotIn(self.templates[0].id, [pk for pk, _ in result])
+
+    def test_empty_index(self):
+        """No production embeddings: nothing to return, no error."""
+        WorkflowTemplate.objects.all().delete()
+
+        self.assertEqual(self._nearest('flat', self.query, 5), [])
+        self.assertEqual(self._nearest('flat', self.query, 5, exclude=1), [])
+
+    def test_top_k_clips_and_orders(self):
+        """_top_k returns indices best first, all of them when k exceeds N."""
+        scores = np.array([0.1, 0.9, 0.5, 0.7], dtype=np.float32)
+
+        self.assertEqual(list(_top_k(scores, 2)), [1, 3])
+        self.assertEqual(list(_top_k(scores, 10)), [1, 3, 2, 0])
+
+    @skipIf(faiss is None, "faiss is not installed")
+    def test_quantized_rescoring_matches_exact(self):
+        """sq8 and binary shortlists, rescored, give the exact top-k."""
+        expected = self._nearest('flat', self.query, 5)
+        expected_excluding = self._nearest('flat', self.vectors[16], 5, exclude=self.templates[16].id)
+
+        for kind in ('sq8', 'binary'):
+            with self.subTest(kind=kind):
+                index = self._index(kind)
+                self.assertIsNotNone(index.faiss)
+                self.assertEqual(index.faiss_binary, kind == 'binary')
+                with patch('templates.services.TEMPLATE_VECTOR_INDEX', kind):
+                    result = index.nearest(self.query, 5)
+                    excluding = index.nearest(self.vectors[16], 5, exclude=self.templates[16].id)
+                self.assertEqual([pk for pk, _ in result], [pk for pk, _ in expected])
+                self.assertEqual([pk for pk, _ in excluding], [pk for pk, _ in expected_excluding])
+                for (_, score), (_, exact) in zip(result, expected):
+                    self.assertAlmostEqual(score, exact, places=5)
+
+    def test_refresh_does_not_touch_captured_snapshot(self):
+        """A reader's snapshot keeps its own ids, rows and matrix across a rebuild."""
+        index = TemplateEmbeddingIndex()
+        snapshot = index.refresh()
+        before = snapshot.nearest(self.query, 5)
+        
+        WorkflowTemplate.objects.filter(id__in=self.ids[:24]).delete()
+        index.invalidate()
+        rebuilt = index.refresh()
+        
+        self.assertIsNot(rebuilt, snapshot)
+        self.assertEqual(len(rebuilt.ids), 24)
+        self.assertEqual(len(snapshot.ids), 48)
+        self.assertEqual(len(snapshot.rows), snapshot.matrix.shape[0])
+        self.assertEqual(snapshot.nearest(self.query, 5), before)
+        self.assertFalse(snapshot.matrix.flags.writeable)
+
+
+class ScrubCredentialsTests(SimpleTestCase):
+    """
+    Tests for TemplateService._scrub_credentials.
+    """
+    def setUp(self):
+        self.nodes = [
+            {
+                'id': 'llm',
+                'type': 'openai',
+                'data': {
+                    'credential_id': 42,
+                    'config': {
+                        'model': 'gpt-4o',
+                        'api_key': 'sk-live',
+                        'AuthToken': 'tok',
+                        'client_secret': 's3cret',
+                        'password': 'hunter2',
+                        'credential': {'id': 42},
+                        'prompt': {'text': 'Summarize'},
+                    },
+                },
+            },
+            {
+                'id': 'http',
+                'type': 'http_request',
+                'data': {'credential_id': 7, 'config': {'url': 'https://example.com'}},
+            },
+            {
+                'id': 'set',
+                'type': 'set',
+                'data': {'config': {'values': [{'name': 'a', 'value': 1}]}},
+            },
+            {'id': 'bare', 'type': 'manual_trigger'},
+        ]
+        self.original = copy.deepcopy(self.nodes)
+        self.scrubbed = TemplateService()._scrub_credentials(self.nodes)
+
+    def test_credentials_and_secrets_are_blanked(self):
+        """credential_id, credential and secret-looking config keys lose their values."""
+        llm, http = self.scrubbed[0]['data'], self.scrubbed[1]['data']
+        
+        self.assertIsNone(llm['credential_id'])
+        self.assertIsNone(llm['config']['credential'])
+        for key in ('api_key', 'AuthToken', 'client_secret', 'password'):
+            self.assertEqual(llm['config'][key], '')
+        self.assertEqual(llm['config']['model'], 'gpt-4o')
+        self.assertEqual(llm['config']['prompt'], {'text': 'Summarize'})
+        
+        self.assertIsNone(http['credential_id'])
+        self.assertEqual(http['config'], {'url': 'https://example.com'})
+
+    def test_input_nodes_are_not_modified(self):
+        """The workflow's own node list is left exactly as it was."""
+        self.assertEqual(self.nodes, self.original)
+        self.assertEqual(self.nodes[0]['data']['config']['api_key'], 'sk-live')
+        self.assertIsNot(self.scrubbed[0]['data']['config'], self.nodes[0]['data']['config'])
+
+    def test_nodes_without_credentials_pass_through(self):
+        """Nodes with nothing to scrub come back unchanged."""
+        self.assertEqual(len(self.scrubbed), len(self.nodes))
+        self.assertEqual(self.scrubbed[2:], self.original[2:])
+        self.assertEqual([n['id'] for n in self.scrubbed], ['llm', 'http', 'set', 'bare'])
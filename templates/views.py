@@ -19,6 +19,24 @@ from .serializers import (
 )
 from .services import TemplateService
 
+# TemplateListItemSerializer's model fields; is_bookmarked is added by _with_bookmarks
+TEMPLATE_LIST_FIELDS = tuple(
+    field for field in TemplateListItemSerializer.Meta.fields if field != 'is_bookmarked'
+)
+
+
+def _with_bookmarks(rows: list, user) -> list:
+    """Add is_bookmarked to list rows with one query for the whole page."""
+    bookmarked = set(
+        WorkflowBookmark.objects.filter(
+            user=user, template_id__in=[row['id'] for row in rows]
+        ).values_list('template_id', flat=True)
+    )
+    for row in rows:
+        row['is_bookmarked'] = row['id'] in bookmarked
+    return rows
+
+
 class TemplatePagination(PageNumberPagination):
     page_size = 12
     page_size_query_param = 'page_size'
@@ -50,16 +68,17 @@ def template_list(request):
         'trending': '-fork_count'
     }
     
-    queryset = queryset.order_by(sort_options.get(params['sort'], '-usage_count'))
+    # Plain dicts with the TemplateListItemSerializer fields; no model instances
+    queryset = queryset.order_by(sort_options.get(params['sort'], '-usage_count')).values(
+        *TEMPLATE_LIST_FIELDS
+    )
     
     paginator = TemplatePagination()
     page = paginator.paginate_queryset(queryset, request)
     if page is not None:
-        serializer = TemplateListItemSerializer(page, many=True, context={'request': request})
-        return paginator.get_paginated_response(serializer.data)
+        return paginator.get_paginated_response(_with_bookmarks(list(page), request.user))
         
-    serializer = TemplateListItemSerializer(queryset, many=True, context={'request': request})
-    return Response(serializer.data)
+    return Response(_with_bookmarks(list(queryset), request.user))
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -67,7 +86,7 @@ def template_detail(request, pk):
     """
     Get template details.
     """
-    template = get_object_or_404(WorkflowTemplate, pk=pk)
+    template = get_object_or_404(WorkflowTemplate.objects.defer('embedding'), pk=pk)
     serializer = WorkflowTemplateSerializer(template, context={'request': request})
     return Response(serializer.data)
 
@@ -94,12 +113,10 @@ async def template_search(request):
     
     @sync_to_async
     def get_serialized_data(items):
-        serializer = TemplateListItemSerializer(
-            items, 
-            many=True, 
-            context={'request': request}
-        )
-        return serializer.data
+        # No request in the context, so the serializer skips its per-item
+        # bookmark query; _with_bookmarks fills the flag in with one query
+        serializer = TemplateListItemSerializer(items, many=True)
+        return _with_bookmarks(serializer.data, request.user)
 
     serialized_items = await get_serialized_data(results['items'])
     
@@ -202,17 +219,10 @@ def template_comments(request, pk):
 async def similar_templates(request, pk):
     """Recommendation: find vector-similar templates."""
     # Use sync_to_async for get_object_or_404 or aget
-    template = await WorkflowTemplate.objects.aget(pk=pk, status='production')
+    template = await WorkflowTemplate.objects.only('id', 'name').aget(pk=pk, status='production')
     
     service = TemplateService()
-    # Simple semantic search using template name
-    results = await service.hybrid_search(
-        query=template.name,
-        page_size=5
-    )
-    
-    # Filter out itself
-    others = [item for item in results['items'] if item.id != template.id]
+    others = await service.similar_templates(template, limit=5)
     
     @sync_to_async
     def get_serialized_data(items):
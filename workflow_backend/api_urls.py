@@ -0,0 +1,14 @@
+"""
+URL configuration for the apps mounted directly under api/.
+
+Core, compiler and skills share the bare api/ prefix, so their patterns
+are concatenated into one list and resolved by a single include rather
+than three sibling resolvers. None of them declares an app namespace.
+"""
+from compiler.urls import urlpatterns as compiler_patterns
+from core.urls import urlpatterns as core_patterns
+from skills.urls import urlpatterns as skills_patterns
+
+
+# Core first: its router's API root view shadows the skills router's one
+urlpatterns = core_patterns + compiler_patterns + skills_patterns
@@ -22,6 +22,10 @@ django_asgi_app = get_asgi_application()
 # Import routing after Django setup
 from streaming.routing import websocket_urlpatterns
 from core.channels_middleware import JWTAuthMiddleware
+from workflow_backend.urls import warm_url_resolver
+
+# Pay the URLconf import and resolver build at boot, not on the first request
+warm_url_resolver()
 
 application = ProtocolTypeRouter({
     # HTTP requests handled by Django
@@ -0,0 +1,77 @@
+"""
+URL Resolvers
+
+PrefixDispatchResolver routes on the first path segment with a dict
+lookup instead of trying each child pattern in turn, and memoizes the
+match for recently seen paths.
+"""
+from functools import cached_property, lru_cache
+
+from django.urls import URLResolver
+from django.urls.resolvers import RoutePattern
+
+from workflow_backend.thresholds import URL_RESOLVE_CACHE_SIZE
+
+
+def _literal_segment(pattern) -> str | None:
+    """
+    First path segment a child pattern can only match literally, if any.
+
+    Regex routes, converters in the first segment and unterminated include
+    prefixes (which match by prefix, e.g. 'foo' also matches 'foobar/')
+    have no literal segment and are tried for every path.
+    """
+    if not isinstance(pattern, RoutePattern):
+        return None
+    route = str(pattern)
+    segment, slash, _ = route.partition('/')
+    if not segment or '<' in segment:
+        return None
+    if slash or pattern._is_endpoint:
+        return segment
+    return None
+
+
+class PrefixDispatchResolver(URLResolver):
+    """
+    URLResolver that only tries the children that can match a path.
+
+    Children are bucketed by their literal first segment; each bucket also
+    holds, in their original positions, the children without one. Every
+    bucket is a plain URLResolver with this resolver's own pattern and
+    namespace, so a match is exactly what a full scan would return. Paths
+    whose first segment no child names fall back to the full scan.
+    reverse() still uses the complete url_patterns.
+
+    Successful matches are kept in a per-resolver LRU keyed on the path;
+    misses (Resolver404) are not cached. URLconfs only change on restart.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._resolve_cached = lru_cache(maxsize=URL_RESOLVE_CACHE_SIZE)(self._dispatch)
+
+    @cached_property
+    def _buckets(self) -> dict[str, URLResolver]:
+        keyed = [(_literal_segment(p.pattern), p) for p in self.url_patterns]
+        buckets = {}
+        for segment in dict.fromkeys(s for s, _ in keyed if s is not None):
+            buckets[segment] = URLResolver(
+                self.pattern,
+                [p for s, p in keyed if s is None or s == segment],
+                self.default_kwargs,
+                self.app_name,
+                self.namespace,
+            )
+        return buckets
+
+    def resolve(self, path):
+        return self._resolve_cached(str(path))
+
+    def _dispatch(self, path):
+        match = self.pattern.match(path)
+        if match:
+            bucket = self._buckets.get(match[0].partition('/')[0])
+            if bucket is not None:
+                return bucket.resolve(path)
+        return super().resolve(path)
@@ -161,6 +161,7 @@ MIDDLEWARE = [
     'core.middleware.RequestLoggingMiddleware',
     'core.middleware.InputSanitizationMiddleware',
     'core.middleware.RateLimitHeaderMiddleware',
+    'core.middleware.CacheControlMiddleware',
 ]
 
 ROOT_URLCONF = 'workflow_backend.urls'
@@ -350,6 +351,12 @@ CELERY_RESULT_SERIALIZER = 'json'
 # Flag to enable background execution via Celery workers
 RUN_WORKFLOWS_ASYNC = os.environ.get('RUN_WORKFLOWS_ASYNC', 'False') == 'True'
 
+# Optional URL surfaces; disabled ones are never mounted in urls.py
+ENABLE_WEBHOOKS = os.environ.get('ENABLE_WEBHOOKS', 'True') == 'True'
+ENABLE_TEMPLATES = os.environ.get('ENABLE_TEMPLATES', 'True') == 'True'
+ENABLE_MCP = os.environ.get('ENABLE_MCP', 'True') == 'True'
+ENABLE_ADMIN = os.environ.get('ENABLE_ADMIN', 'True') == 'True'
+
 # ============================================
 # Credential Encryption
 # ============================================
@@ -0,0 +1,127 @@
+"""
+Tests for URL Resolvers
+
+Tests for:
+- PrefixDispatchResolver resolve() and reverse() parity with URLResolver
+- Resolved-path LRU
+"""
+from django.http import HttpResponse
+from django.test import SimpleTestCase
+from django.urls import (
+    NoReverseMatch, Resolver404, URLResolver, include, path, re_path, resolve, reverse,
+)
+from django.urls.resolvers import RoutePattern
+
+from workflow_backend.resolvers import PrefixDispatchResolver
+
+
+def _view(request, *args, **kwargs):
+    return HttpResponse()
+
+
+def _other_view(request, *args, **kwargs):
+    return HttpResponse()
+
+
+API_PATTERNS = [
+    path('auth/', include(([path('login/', _view, name='login')], 'auth'), namespace='auth')),
+    path('', include([path('health/', _other_view, name='health')])),
+    re_path(r'^legacy/(?P<pk>\d+)/$', _view, name='legacy'),
+    # Regex child ahead of the literal 'items' child: must still win for items/0/
+    re_path(r'^items/0/$', _other_view, name='item-zero'),
+    path('items/<int:pk>/', _view, name='item'),
+    path('foo', include([path('bar/', _other_view, name='foobar')])),
+    path('nodes/', _other_view, name='nodes'),
+]
+
+RESOLVABLE_PATHS = (
+    '/api/auth/login/',
+    '/api/health/',
+    '/api/legacy/5/',
+    '/api/items/3/',
+    '/api/items/0/',
+    '/api/foobar/',
+    '/api/nodes/',
+)
+
+MISSING_PATHS = (
+    '/api/',
+    '/api/nope/',
+    '/api/auth/nope/',
+    '/api/items/abc/',
+    '/other/',
+)
+
+
+class PlainURLConf:
+    urlpatterns = [URLResolver(RoutePattern('api/'), API_PATTERNS)]
+
+
+class DispatchURLConf:
+    urlpatterns = [PrefixDispatchResolver(RoutePattern('api/'), API_PATTERNS)]
+
+
+class PrefixDispatchResolverTests(SimpleTestCase):
+    """PrefixDispatchResolver must be indistinguishable from URLResolver."""
+
+    def _summary(self, match):
+        return (
+            match.func, match.args, match.kwargs, match.url_name,
+            match.namespaces, match.route,
+        )
+
+    def test_resolve_matches_plain_resolver(self):
+        """Namespaced, bare '' and regex children resolve identically."""
+        for url in RESOLVABLE_PATHS:
+            with self.subTest(url=url):
+                self.assertEqual(
+                    self._summary(resolve(url, DispatchURLConf)),
+                    self._summary(resolve(url, PlainURLConf)),
+                )
+
+    def test_missing_paths_raise_404(self):
+        """Paths no child matches raise Resolver404 like a full scan."""
+        for url in MISSING_PATHS:
+            with self.subTest(url=url):
+                with self.assertRaises(Resolver404):
+                    resolve(url, PlainURLConf)
+                with self.assertRaises(Resolver404):
+                    resolve(url, DispatchURLConf)
+
+    def test_misses_are_not_cached(self):
+        """A 404 is raised again on repeat, not replayed from the LRU."""
+        for _ in range(2):
+            with self.assertRaises(Resolver404):
+                resolve('/api/nope/', DispatchURLConf)
+
+    def test_reverse_matches_plain_resolver(self):
+        """reverse() sees every child, including namespaced includes."""
+        cases = (
+            ('auth:login', {}),
+            ('health', {}),
+            ('legacy', {'pk': 7}),
+            ('item', {'pk': 3}),
+            ('item-zero', {}),
+            ('foobar', {}),
+            ('nodes', {}),
+        )
+        for name, kwargs in cases:
+            with self.subTest(name=name):
+                self.assertEqual(
+                    reverse(name, DispatchURLConf, kwargs=kwargs),
+                    reverse(name, PlainURLConf, kwargs=kwargs),
+                )
+        with self.assertRaises(NoReverseMatch):
+            reverse('missing', DispatchURLConf)
+
+    def test_lru_does_not_return_stale_match(self):
+        """Each distinct path gets its own match, cached or not."""
+        first = resolve('/api/items/1/', DispatchURLConf)
+        second = resolve('/api/items/2/', DispatchURLConf)
+        self.assertEqual(first.kwargs, {'pk': 1})
+        self.assertEqual(second.kwargs, {'pk': 2})
+        self.assertEqual(resolve('/api/items/1/', DispatchURLConf).kwargs, {'pk': 1})
+
+        self.assertEqual(resolve('/api/nodes/', DispatchURLConf).url_name, 'nodes')
+        self.assertEqual(resolve('/api/health/', DispatchURLConf).url_name, 'health')
+        self.assertEqual(resolve('/api/nodes/', DispatchURLConf).url_name, 'nodes')
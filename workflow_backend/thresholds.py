@@ -28,6 +28,9 @@ CHUNK_SIZE = 500
 CHUNK_OVERLAP = 50
 SEARCH_TOP_K = 5
 SEARCH_MIN_SCORE = 0.3
+TEMPLATE_EMBEDDING_INDEX_TTL_SECONDS = 300  # Max age of a process's template embedding matrix (other processes' edits)
+TEMPLATE_VECTOR_INDEX = 'flat'  # FAISS index for template top-k: 'flat' (exact), 'sq8' (int8) or 'binary' (sign bits); quantized ones are rescored
+TEMPLATE_VECTOR_RESCORE_FACTOR = 4  # Candidates per requested result taken from a quantized index before exact rescoring
 
 # ==================== Execution & Workflow Limits ====================
 DEFAULT_HITL_TIMEOUT_SECONDS = 300  # Human-in-the-loop timeout
@@ -39,6 +42,17 @@ MAX_DOCUMENT_SIZE = 50 * 1024 * 1024  # 50MB limit for general uploads
 DATA_UPLOAD_MAX_MEMORY_SIZE = 104857600  # 100MB for request payload memory
 FILE_UPLOAD_MAX_MEMORY_SIZE = 104857600  # 100MB for file upload memory
 DATA_UPLOAD_MAX_NUMBER_FIELDS = 10000    # Increase field limit for complex workflows
+URL_RESOLVE_CACHE_SIZE = 4096  # Distinct api/ paths whose resolved view is memoized per process
 
 # ==================== Subprocess & Internal Timeouts ====================
 IMPORT_CHECK_TIMEOUT_SECONDS = 15  # Import checking timeout
+
+# ==================== Streaming & WebSocket Limits ====================
+WS_BATCH_MAX_EVENTS = 128  # Max channel-layer events coalesced into one WebSocket frame
+WS_BATCH_WINDOW_SECONDS = 0.01  # How long a burst may keep filling a batch before it is sent
+WS_OUTBOUND_QUEUE_SIZE = 1000  # Events buffered per WebSocket for a slow client before new ones are dropped
+EXECUTION_ACCESS_CACHE_SIZE = 10_000  # Executions whose owner is cached for WebSocket access checks
+EXECUTION_ACCESS_CACHE_TTL_SECONDS = 60
+STREAM_TIER_CACHE_TTL_SECONDS = 300  # How long a user's tier is cached for the stream status endpoint
+STREAM_EVENT_WRITE_BATCH_SIZE = 500  # Max broadcast events persisted per COPY / bulk insert
+STREAM_EVENT_WRITE_WINDOW_SECONDS = 0.05  # How long a batch may keep filling before it is written
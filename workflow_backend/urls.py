@@ -1,70 +1,99 @@
 """
 URL configuration for workflow_backend project.
 """
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import path, include
-from django.http import JsonResponse
-from orchestrator.views import receive_webhook
+from django.urls import path, include, get_resolver
+from django.urls.resolvers import RoutePattern
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_safe
+
+from .resolvers import PrefixDispatchResolver
+
+
+# Serialized once; middleware mutates response headers, so only the body is shared
+_HEALTH_BODY = b'{"status":"healthy","service":"workflow-backend"}'
 
 
+@csrf_exempt
+@require_safe
 def health_check(request):
     """Health check endpoint for Docker/load balancers"""
-    return JsonResponse({'status': 'healthy', 'service': 'workflow-backend'})
+    return HttpResponse(_HEALTH_BODY, content_type='application/json')
 
 
-urlpatterns = [
-    path('admin/', admin.site.urls),
-    
-    # Health check
-    path('api/health/', health_check, name='health-check'),
+# Everything under api/, relative to that prefix. Django returns the first
+# match and no two includes below serve the same URL, so the list is
+# ordered by request volume: hottest first.
+api_patterns = [
+    # Orchestrator (workflows, executions, HITL, chat)
+    path('orchestrator/', include('orchestrator.urls')),
     
-    # Core (auth, users, API keys)
-    path('api/', include('core.urls')),
+    # Streaming (SSE, events)
+    path('streaming/', include('streaming.urls')),
     
-    # Nodes (node registry, schemas)
-    path('api/', include('nodes.urls')),
+    # Inference (documents, RAG)
+    path('inference/', include('inference.urls')),
+]
+
+if settings.ENABLE_WEBHOOKS:
+    # Webhooks (Public)
+    api_patterns += [path('webhooks/', include('orchestrator.webhook_urls'))]
+
+api_patterns += [
+    # Health check
+    path('health/', health_check, name='health-check'),
     
-    # Compiler (workflow compile/validate)
-    path('api/', include('compiler.urls')),
+    # Standalone Chat
+    path('chat/', include('chat.urls')),
     
-    # Streaming (SSE, events)
-    path('api/streaming/', include('streaming.urls')),
+    # Core (auth, users, API keys), compiler and skills
+    path('', include('workflow_backend.api_urls')),
     
-    # Orchestrator (workflows, executions, HITL, chat)
-    path('api/orchestrator/', include('orchestrator.urls')),
+    # Nodes (node registry, schemas)
+    path('nodes/', include('nodes.urls')),
     
     # Logs (insights, audit, executions)
-    path('api/logs/', include('logs.urls')),
+    path('logs/', include('logs.urls')),
     
-    # Inference (documents, RAG)
-    path('api/inference/', include('inference.urls')),
-
     # Credentials
-    path('api/credentials/', include('credentials.urls')),
-    
-    # Templates
+    path('credentials/', include('credentials.urls')),
+]
+
+if settings.ENABLE_TEMPLATES:
     # Templates
-    path('api/orchestrator/templates/', include('templates.urls')),
-    
-    # Webhooks (Public)
-    path('api/webhooks/<int:user_id>/<path:webhook_path>', receive_webhook, name='webhook_receiver'),
-    
+    api_patterns += [path('orchestrator/templates/', include('templates.urls'))]
+
+if settings.ENABLE_MCP:
     # MCP
-    path('api/mcp/', include('mcp_integration.urls')),
+    api_patterns += [path('mcp/', include('mcp_integration.urls'))]
 
-    # Skills
-    path('api/', include('skills.urls')),
-    
-    # Standalone Chat
-    path('api/chat/', include('chat.urls')),
+
+urlpatterns = [
+    # api/ dispatches on its next path segment instead of scanning api_patterns
+    PrefixDispatchResolver(RoutePattern('api/'), api_patterns),
 ]
 
+if settings.ENABLE_ADMIN:
+    urlpatterns += [path('admin/', admin.site.urls)]
 
 # Serve media files in development
-from django.conf import settings
-from django.conf.urls.static import static
-
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
 
+
+def warm_url_resolver():
+    """
+    Import every included URLconf and build the reverse/namespace tables.
+
+    Django does this lazily on the first request that resolves or reverses
+    a URL; the ASGI/WSGI entry points call this at boot instead.
+    """
+    resolver = get_resolver()
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, PrefixDispatchResolver):
+            pattern._buckets
+    resolver.reverse_dict
+    resolver.namespace_dict
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'workflow_backend.settings')
 
 application = get_wsgi_application()
+
+from workflow_backend.urls import warm_url_resolver
+
+# Pay the URLconf import and resolver build at boot, not on the first request
+warm_url_resolver()